@@ -18,6 +18,11 @@ load_dotenv()
 from config.settings import get_config
 from config.logging import setup_logging
 from database import init_db
+from services.analytics_queue import analytics_events
+from services.export_jobs import export_jobs
+from services.background_jobs import image_analysis_jobs
+from services.stats_refresher import message_stats_refresher
+from services.plant_id_service import PlantIdService
 from knowledge.agricultural_knowledge import AgriculturalKnowledgeBase
 from nlp import NLPProcessor
 from services.data_coordinator import DataCoordinator
@@ -27,12 +32,41 @@ from app.routes.auth import auth_bp
 from app.routes.chat import chat_bp
 from app.routes.api import api_bp
 from utils.exceptions import AgriBotException
+from utils.responses import OrjsonProvider, error_body, error_response, raw_json_response
+
+try:
+    from flask_session import Session
+    _HAS_FLASK_SESSION = True
+except ImportError:
+    Session = None
+    _HAS_FLASK_SESSION = False
+
+# Pre-serialized bodies for the fixed-message error handlers
+_ERR_BAD_REQUEST = error_body('Bad request')
+_ERR_UNAUTHORIZED = error_body('Authentication required')
+_ERR_FORBIDDEN = error_body('Access forbidden')
+_ERR_NOT_FOUND = error_body('Endpoint not found')
+_ERR_METHOD_NOT_ALLOWED = error_body('Method not allowed')
+_ERR_VALIDATION = error_body('Validation failed')
+_ERR_RATE_LIMIT = error_body('Rate limit exceeded')
+_ERR_INTERNAL = error_body('Internal server error')
+_ERR_UNAVAILABLE = error_body('Service temporarily unavailable')
+_ERR_TOO_LARGE = error_body('Request body too large')
+
+# Largest accepted request body: a 10MB image upload plus its form fields
+_MAX_REQUEST_BYTES = 11 * 1024 * 1024
 
 def create_app(config_name=None):
     """Create and configure Flask application"""
     
     # Create Flask app with correct template directory
     app = Flask(__name__, template_folder='../templates', static_folder='../static')
+
+    # Encode jsonify() responses with orjson when it is installed, compact
+    # and in insertion order even in debug mode
+    app.json = OrjsonProvider(app)
+    app.json.compact = True
+    app.json.sort_keys = False
     
     # Load configuration
     config = get_config(config_name)
@@ -42,13 +76,16 @@ def create_app(config_name=None):
         'SECRET_KEY': config.secret_key,
         'DEBUG': config.debug,
         'TESTING': config.testing,
+        'ENABLE_DEBUG_AUTH': config.enable_debug_auth,
         'SQLALCHEMY_DATABASE_URI': config.database.url,
         'SQLALCHEMY_TRACK_MODIFICATIONS': config.database.track_modifications,
         'SQLALCHEMY_ENGINE_OPTIONS': {
             'pool_size': config.database.pool_size,
             'max_overflow': config.database.max_overflow
         },
-        'SEND_FILE_MAX_AGE_DEFAULT': 0  # Disable caching in debug mode
+        'SEND_FILE_MAX_AGE_DEFAULT': 0,  # Disable caching in debug mode
+        # Refuse oversize bodies before Werkzeug parses them
+        'MAX_CONTENT_LENGTH': _MAX_REQUEST_BYTES
     })
     
     # Store config object for access throughout app
@@ -58,6 +95,9 @@ def create_app(config_name=None):
     setup_logging(app, config.logging)
     app.logger.info("AgriBot application starting up")
     
+    # Keep sessions server-side in Redis when available
+    init_session_store(app, config.cache)
+    
     # Enable CORS for API access
     CORS(app, resources={
         r"/api/*": {"origins": "*"},
@@ -68,12 +108,26 @@ def create_app(config_name=None):
     init_db(app)
     app.logger.info("Database initialized")
     
+    # Write analytics events in background batches
+    analytics_events.init_app(app)
+
+    # Run queued dataset exports off the request thread
+    export_jobs.init_app(app)
+    image_analysis_jobs.init_app(app)
+
+    # Rebuild the message stats rollup on a schedule, not per request
+    message_stats_refresher.init_app(app)
+    
     # Initialize AgriBot engine with dependency injection
     app.agribot = create_agribot_engine(config, app.logger)
     app.logger.info("AgriBot engine initialized")
     
-    # Store data coordinator for direct API access
+    # Store data coordinator and knowledge base for direct API access
     app.data_coordinator = app.agribot.data_coordinator
+    app.knowledge_base = app.agribot.knowledge_base
+
+    # One plant identification client per app so its HTTP connections are reused
+    app.plant_id_service = PlantIdService()
     
     # Register authentication blueprint first
     app.register_blueprint(auth_bp)
@@ -375,7 +429,7 @@ def create_agribot_engine(config, logger):
         return engine
         
     except Exception as e:
-        logger.error(f"Failed to create AgriBot engine: {str(e)}")
+        logger.error("Failed to create AgriBot engine: %s", e)
         raise
 
 def register_error_handlers(app):
@@ -384,36 +438,23 @@ def register_error_handlers(app):
     @app.errorhandler(AgriBotException)
     def handle_agribot_exception(e):
         """Handle AgriBot-specific exceptions"""
-        app.logger.error(f"AgriBot exception: {str(e)}")
-        return {
-            'success': False,
-            'error': str(e),
-            'error_type': 'agribot_error'
-        }, 500
+        app.logger.error("AgriBot exception: %s", e)
+        return error_response(str(e), 500, error_type='agribot_error')
     
     @app.errorhandler(400)
     def bad_request(error):
         """Handle 400 errors"""
-        return {
-            'success': False,
-            'error': 'Bad request'
-        }, 400
+        return raw_json_response(_ERR_BAD_REQUEST, 400)
     
     @app.errorhandler(401)
     def unauthorized(error):
         """Handle 401 errors"""
-        return {
-            'success': False,
-            'error': 'Authentication required'
-        }, 401
+        return raw_json_response(_ERR_UNAUTHORIZED, 401)
     
     @app.errorhandler(403)
     def forbidden(error):
         """Handle 403 errors"""
-        return {
-            'success': False,
-            'error': 'Access forbidden'
-        }, 403
+        return raw_json_response(_ERR_FORBIDDEN, 403)
     
     @app.errorhandler(404)
     def not_found(error):
@@ -422,41 +463,33 @@ def register_error_handlers(app):
         if request.accept_mimetypes.accept_html:
             return redirect('/login.html')
         
-        return {
-            'success': False,
-            'error': 'Endpoint not found'
-        }, 404
+        return raw_json_response(_ERR_NOT_FOUND, 404)
     
     @app.errorhandler(405)
     def method_not_allowed(error):
         """Handle 405 errors"""
-        return {
-            'success': False,
-            'error': 'Method not allowed'
-        }, 405
+        return raw_json_response(_ERR_METHOD_NOT_ALLOWED, 405)
+    
+    @app.errorhandler(413)
+    def request_too_large(error):
+        """Handle bodies over MAX_CONTENT_LENGTH"""
+        return raw_json_response(_ERR_TOO_LARGE, 413)
     
     @app.errorhandler(422)
     def validation_error(error):
         """Handle validation errors"""
-        return {
-            'success': False,
-            'error': 'Validation failed'
-        }, 422
+        return raw_json_response(_ERR_VALIDATION, 422)
     
     @app.errorhandler(429)
     def rate_limit_exceeded(error):
         """Handle rate limiting"""
-        return {
-            'success': False,
-            'error': 'Rate limit exceeded'
-        }, 429
+        return raw_json_response(_ERR_RATE_LIMIT, 429)
     
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors"""
         import traceback
-        app.logger.error(f"Internal server error: {str(error)}")
-        app.logger.error(f"Traceback: {traceback.format_exc()}")
+        app.logger.exception("Internal server error: %s", error)
         if app.debug:
             return {
                 'success': False,
@@ -464,18 +497,12 @@ def register_error_handlers(app):
                 'details': str(error),
                 'traceback': traceback.format_exc()
             }, 500
-        return {
-            'success': False,
-            'error': 'Internal server error'
-        }, 500
+        return raw_json_response(_ERR_INTERNAL, 500)
     
     @app.errorhandler(503)
     def service_unavailable(error):
         """Handle service unavailable"""
-        return {
-            'success': False,
-            'error': 'Service temporarily unavailable'
-        }, 503
+        return raw_json_response(_ERR_UNAVAILABLE, 503)
 
 def register_request_handlers(app):
     """Register request lifecycle handlers"""
@@ -494,9 +521,9 @@ def register_request_handlers(app):
             g.account_type = None
         
         # Log request info (excluding sensitive data)
-        if not request.endpoint or 'static' not in request.endpoint:
+        if app.logger.isEnabledFor(logging.INFO) and (not request.endpoint or 'static' not in request.endpoint):
             user_info = f"user:{g.user_id}" if g.user_id else "anonymous"
-            app.logger.info(f"Request: {request.method} {request.path} [{user_info}]")
+            app.logger.info("Request: %s %s [%s]", request.method, request.path, user_info)
         
         # Security headers for all responses
         g.security_headers = {
@@ -520,11 +547,11 @@ def register_request_handlers(app):
             
             # Log response info
             if not request.endpoint or 'static' not in request.endpoint:
-                app.logger.info(f"Response: {response.status_code} in {duration_ms:.2f}ms")
+                app.logger.info("Response: %s in %.2fms", response.status_code, duration_ms)
                 
                 # Log slow requests
                 if duration_ms > 1000:
-                    app.logger.warning(f"Slow request: {request.method} {request.path} took {duration_ms:.2f}ms")
+                    app.logger.warning("Slow request: %s %s took %.2fms", request.method, request.path, duration_ms)
         
         return response
     
@@ -533,7 +560,33 @@ def register_request_handlers(app):
         """Clean up after request"""
         # Database connections are handled by SQLAlchemy
         if error:
-            app.logger.error(f"Request teardown error: {str(error)}")
+            app.logger.error("Request teardown error: %s", error)
+
+def init_session_store(app, cache_config):
+    """Store sessions in Redis so they are revocable; fall back to signed cookies"""
+    if not (_HAS_FLASK_SESSION and cache_config.enabled):
+        return
+    
+    try:
+        import redis
+        from services.cache.simple_cache import cache
+        # Reuse the cache's connection pool when it points at the same server
+        client = getattr(cache, 'client', None)
+        if client is None or cache.config.url != cache_config.url:
+            client = redis.from_url(cache_config.url, socket_timeout=5)
+        client.ping()
+    except Exception as e:
+        app.logger.warning("Redis session store unavailable (%s), using cookie sessions", e)
+        return
+    
+    app.config.update({
+        'SESSION_TYPE': 'redis',
+        'SESSION_REDIS': client,
+        'SESSION_USE_SIGNER': True,
+        'SESSION_KEY_PREFIX': f"{cache_config.key_prefix}session:",
+    })
+    Session(app)
+    app.logger.info("Using Redis-backed sessions")
 
 def setup_session_config(app):
     """Configure session management"""
@@ -27,10 +27,14 @@ from collections import Counter
 from database.repositories.analytics_repository import AnalyticsRepository
 from database.repositories.user_repository import UserRepository
 from database.repositories.conversation_repository import ConversationRepository
-from database.models.user import User
+from database.models.user import User, enum_value
 from database.models.conversation import Conversation, Message
 from database.models.analytics import Feedback
 from database import db
+from services.cache.response_cache import analysis_cache
+from app.routes.api import invalidate_knowledge_caches
+from app.routes.auth import admin_required
+from utils.responses import error_body, error_response, raw_json_response
 from utils.exceptions import AgriBotException
 from app.routes.report_charts import (
     create_user_growth_chart,
@@ -52,10 +56,7 @@ def get_detailed_analytics():
         # Get time period parameter
         days = request.args.get('days', 30, type=int)
         if days < 1 or days > 365:
-            return jsonify({
-                'success': False,
-                'error': 'Days parameter must be between 1 and 365'
-            }), 400
+            return error_response('Days parameter must be between 1 and 365', 400)
         
         analytics_repo = AnalyticsRepository()
         analytics_data = analytics_repo.get_comprehensive_analytics(days=days)
@@ -70,10 +71,7 @@ def get_detailed_analytics():
         import traceback
         logger.error(f"Error getting detailed analytics: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve detailed analytics'
-        }), 500
+        return error_response('Failed to retrieve detailed analytics', 500)
 
 @admin_bp.route('/system/status', methods=['GET'])
 def get_system_status():
@@ -117,10 +115,28 @@ def get_system_status():
         
     except Exception as e:
         logger.error(f"Error getting system status: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve system status'
-        }), 500
+        return error_response('Failed to retrieve system status', 500)
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """Get hit/miss statistics for the analysis response cache"""
+    return jsonify({
+        'success': True,
+        'data': analysis_cache.get_stats()
+    })
+
+@admin_bp.route('/cache/clear', methods=['POST'])
+@admin_required
+def clear_response_caches():
+    """Clear memoized API responses so they are rebuilt on next request"""
+    analysis_cache.clear()
+    invalidate_knowledge_caches()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Response caches cleared'
+    })
 
 @admin_bp.route('/system/cleanup', methods=['POST'])
 def system_cleanup():
@@ -140,10 +156,7 @@ def system_cleanup():
         
     except Exception as e:
         logger.error(f"Error during system cleanup: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to perform system cleanup'
-        }), 500
+        return error_response('Failed to perform system cleanup', 500)
 
 @admin_bp.route('/conversations/recent', methods=['GET'])
 def get_recent_conversations():
@@ -154,16 +167,10 @@ def get_recent_conversations():
         days = request.args.get('days', 7, type=int)
         
         if limit < 1 or limit > 500:
-            return jsonify({
-                'success': False,
-                'error': 'Limit must be between 1 and 500'
-            }), 400
+            return error_response('Limit must be between 1 and 500', 400)
         
         if days < 1 or days > 30:
-            return jsonify({
-                'success': False,
-                'error': 'Days must be between 1 and 30'
-            }), 400
+            return error_response('Days must be between 1 and 30', 400)
         
         conversation_repo = ConversationRepository()
         
@@ -185,10 +192,7 @@ def get_recent_conversations():
         
     except Exception as e:
         logger.error(f"Error getting recent conversations: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve recent conversations'
-        }), 500
+        return error_response('Failed to retrieve recent conversations', 500)
 
 @admin_bp.route('/feedback/recent', methods=['GET'])
 def get_recent_feedback():
@@ -198,10 +202,7 @@ def get_recent_feedback():
         limit = request.args.get('limit', 20, type=int)
         
         if limit < 1 or limit > 100:
-            return jsonify({
-                'success': False,
-                'error': 'Limit must be between 1 and 100'
-            }), 400
+            return error_response('Limit must be between 1 and 100', 400)
         
         analytics_repo = AnalyticsRepository()
         
@@ -230,10 +231,7 @@ def get_recent_feedback():
         
     except Exception as e:
         logger.error(f"Error getting recent feedback: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve recent feedback'
-        }), 500
+        return error_response('Failed to retrieve recent feedback', 500)
 
 @admin_bp.route('/errors/summary', methods=['GET'])
 def get_error_summary():
@@ -243,10 +241,7 @@ def get_error_summary():
         days = request.args.get('days', 7, type=int)
         
         if days < 1 or days > 30:
-            return jsonify({
-                'success': False,
-                'error': 'Days must be between 1 and 30'
-            }), 400
+            return error_response('Days must be between 1 and 30', 400)
         
         analytics_repo = AnalyticsRepository()
         
@@ -260,10 +255,7 @@ def get_error_summary():
         
     except Exception as e:
         logger.error(f"Error getting error summary: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve error summary'
-        }), 500
+        return error_response('Failed to retrieve error summary', 500)
 
 @admin_bp.route('/users/statistics', methods=['GET'])
 def get_user_statistics():
@@ -279,10 +271,7 @@ def get_user_statistics():
         
     except Exception as e:
         logger.error(f"Error getting user statistics: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve user statistics'
-        }), 500
+        return error_response('Failed to retrieve user statistics', 500)
 
 @admin_bp.route('/health/detailed', methods=['GET'])
 def detailed_health_check():
@@ -391,8 +380,8 @@ def export_users_data(start_date, end_date, format_type):
             user.phone or '',
             user.country or '',
             user.region or '',
-            user.account_type.value if hasattr(user.account_type, 'value') else user.account_type,
-            user.status.value if hasattr(user.status, 'value') else user.status,
+            enum_value(user.account_type),
+            enum_value(user.status),
             conv_count,
             user.created_at.strftime('%Y-%m-%d %H:%M:%S') if user.created_at else '',
             user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else ''
@@ -935,11 +924,7 @@ def generate_comprehensive_pdf_report():
             elements.append(Spacer(1, 0.15*inch))
 
             # Calculate regional insights
-            region_counts = Counter()
-            for user in users:
-                if user.region:
-                    region_name = user.region.value if hasattr(user.region, 'value') else user.region
-                    region_counts[region_name] += 1
+            region_counts = Counter(user.region for user in users if user.region)
 
             top_region = region_counts.most_common(1)[0] if region_counts else ('N/A', 0)
             regional_insight = (
@@ -1305,10 +1290,10 @@ def generate_comprehensive_pdf_report():
 
         return jsonify({'error': f'PDF generation failed: {str(e)}'}), 500
 
+# Pre-serialized body for unknown admin routes
+_ERR_ADMIN_NOT_FOUND = error_body('Admin endpoint not found')
+
 @admin_bp.errorhandler(404)
 def admin_not_found(error):
     """Handle 404 errors for admin routes"""
-    return jsonify({
-        'success': False,
-        'error': 'Admin endpoint not found'
-    }), 404
\ No newline at end of file
+    return raw_json_response(_ERR_ADMIN_NOT_FOUND, 404)
\ No newline at end of file
@@ -5,284 +5,280 @@ Location: agribot/app/routes/api.py
 RESTful API endpoints for accessing agricultural data and services.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, current_app
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
 import logging
+import re
+import time
 
 from knowledge.agricultural_knowledge import AgriculturalKnowledgeBase
-from services.data_coordinator import DataCoordinator
-from database.repositories.analytics_repository import AnalyticsRepository
+from services.cache.simple_cache import cache
+from services.cache.response_cache import analysis_cache
 from utils.exceptions import AgriBotException, APIServiceError
-from utils.validators import validate_region, validate_crop
+from utils.validators import validate_region, validate_crop, SUPPORTED_REGIONS
+from utils.converters import register_converters
+from utils.responses import (
+    dumps, error_body, error_response, json_response, raw_json_response,
+    cached_json_response, etag_for, precompress, negotiated_json_response, success_body,
+    streamed_json_response,
+    negotiated_response, wants_msgpack, packb, MSGPACK_MIMETYPE
+)
 
 # Create blueprint
 api_bp = Blueprint('api', __name__)
 
+@api_bp.record_once
+def _register_url_converters(state):
+    """Make the crop/region converters available before routes are bound"""
+    register_converters(state.app.url_map)
+
 # Logger
 logger = logging.getLogger(__name__)
 
+def _get_knowledge_base() -> AgriculturalKnowledgeBase:
+    """Return the app-wide knowledge base shared with the AgriBot engine"""
+    return current_app.knowledge_base
+
+# Accepted spellings for boolean query flags
+_TRUTHY = frozenset({'true', 'True', 'TRUE', '1', 'yes', 'on'})
+
+# Separator for comma-separated region lists
+_REGION_SPLIT = re.compile(r'\s*,\s*')
+
+# Cache key for the public analytics summary
+_ANALYTICS_SUMMARY_CACHE_KEY = 'api_analytics_summary'
+
+# Pre-serialized bodies for fixed error messages
+_ERR_CROPS = error_body('Failed to retrieve crops list')
+_ERR_CROP_INFO = error_body('Failed to retrieve crop information')
+_ERR_DISEASES = error_body('Failed to retrieve disease information')
+_ERR_FERTILIZER = error_body('Failed to retrieve fertilizer information')
+_ERR_WEATHER = error_body('Failed to retrieve weather information')
+_ERR_REGION_REQUIRED = error_body('Region parameter is required')
+_ERR_ANALYSIS = error_body('Failed to retrieve comprehensive analysis')
+_ERR_REGIONS_REQUIRED = error_body('Regions parameter is required (comma-separated list)')
+_ERR_COMPARE = error_body('Failed to compare regions')
+_ERR_ANALYTICS = error_body('Failed to retrieve analytics summary')
+_ERR_KNOWLEDGE_CROPS = error_body('Failed to retrieve crops knowledge')
+_ERR_KNOWLEDGE_DISEASES = error_body('Failed to retrieve diseases knowledge')
+_ERR_BEST_PRACTICES = error_body('Failed to retrieve best practices')
+_ERR_SEASONAL_CALENDAR = error_body('Failed to retrieve seasonal calendar')
+_ERR_NOT_FOUND = error_body('API endpoint not found')
+_ERR_METHOD_NOT_ALLOWED = error_body('Method not allowed for this endpoint')
+
+# Crop and region knowledge is static, so clients may reuse it for an hour
+_KNOWLEDGE_MAX_AGE = 3600
+
+# Catalog endpoints never change within a worker, so serialize them once
+_REGIONS_BODY = dumps({
+    'success': True,
+    'data': {
+        'regions': SUPPORTED_REGIONS,
+        'total_count': len(SUPPORTED_REGIONS)
+    }
+})
+_REGIONS_ETAG = etag_for(_REGIONS_BODY)
+
+@lru_cache(maxsize=1)
+def _crops_body() -> Tuple[bytes, str]:
+    """Serialized crops catalog and its ETag, built on first request"""
+    crops = _get_knowledge_base().get_all_crops()
+    body = dumps({
+        'success': True,
+        'data': {
+            'crops': crops,
+            'total_count': len(crops)
+        }
+    })
+    return body, etag_for(body)
+
 @api_bp.route('/crops', methods=['GET'])
 def get_crops():
     """Get list of supported crops"""
     try:
-        knowledge_base = AgriculturalKnowledgeBase()
-        crops = knowledge_base.get_all_crops()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'crops': crops,
-                'total_count': len(crops)
-            }
-        })
+        body, etag = _crops_body()
+        return cached_json_response(body, etag)
         
     except Exception as e:
-        logger.error(f"Error getting crops: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve crops list'
-        }), 500
-
-@api_bp.route('/crops/<crop_name>', methods=['GET'])
+        logger.exception("Error getting crops: %s", e)
+        return raw_json_response(_ERR_CROPS, 500)
+
+@lru_cache(maxsize=512)
+def _crop_knowledge(method: str, *args) -> Tuple[bytes, str, Optional[str]]:
+    """Serialized knowledge-base lookup with its ETag, or the lookup error"""
+    data = getattr(_get_knowledge_base(), method)(*args)
+    
+    err = data.get('error')
+    if err is not None:
+        return b'', '', err
+    
+    body = dumps({
+        'success': True,
+        'data': data
+    })
+    return body, etag_for(body), None
+
+def invalidate_knowledge_caches():
+    """Drop memoized knowledge responses, e.g. after the knowledge base is reloaded"""
+    _crops_body.cache_clear()
+    _crop_knowledge.cache_clear()
+
+@api_bp.route('/crops/<crop:crop_name>', methods=['GET'])
 def get_crop_info(crop_name):
     """Get comprehensive information about a specific crop"""
     try:
-        # Validate crop
-        if not validate_crop(crop_name):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid or unsupported crop: {crop_name}'
-            }), 400
-        
-        knowledge_base = AgriculturalKnowledgeBase()
-        crop_info = knowledge_base.get_comprehensive_crop_info(crop_name)
-        
-        if 'error' in crop_info:
-            return jsonify({
-                'success': False,
-                'error': crop_info['error']
-            }), 404
-        
-        return jsonify({
-            'success': True,
-            'data': crop_info
-        })
+        body, etag, err = _crop_knowledge('get_comprehensive_crop_info', crop_name)
+        
+        if err is not None:
+            return error_response(err, 404)
+        
+        return cached_json_response(body, etag, max_age=_KNOWLEDGE_MAX_AGE)
         
     except Exception as e:
-        logger.error(f"Error getting crop info for {crop_name}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve crop information'
-        }), 500
+        logger.exception("Error getting crop info for %s: %s", crop_name, e)
+        return raw_json_response(_ERR_CROP_INFO, 500)
 
-@api_bp.route('/crops/<crop_name>/diseases', methods=['GET'])
+@api_bp.route('/crops/<crop:crop_name>/diseases', methods=['GET'])
 def get_crop_diseases(crop_name):
     """Get disease information for a specific crop"""
     try:
-        # Validate crop
-        if not validate_crop(crop_name):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid crop: {crop_name}'
-            }), 400
-        
-        knowledge_base = AgriculturalKnowledgeBase()
-        
         # Check for specific disease query
         disease_name = request.args.get('disease')
         
         if disease_name:
-            disease_info = knowledge_base.get_disease_info(crop_name, disease_name)
+            body, etag, err = _crop_knowledge('get_disease_info', crop_name, disease_name)
         else:
-            disease_info = knowledge_base.get_disease_info(crop_name)
+            body, etag, err = _crop_knowledge('get_disease_info', crop_name)
         
-        if 'error' in disease_info:
-            return jsonify({
-                'success': False,
-                'error': disease_info['error']
-            }), 404
+        if err is not None:
+            return error_response(err, 404)
         
-        return jsonify({
-            'success': True,
-            'data': disease_info
-        })
+        return cached_json_response(body, etag, max_age=_KNOWLEDGE_MAX_AGE)
         
     except Exception as e:
-        logger.error(f"Error getting diseases for {crop_name}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve disease information'
-        }), 500
+        logger.exception("Error getting diseases for %s: %s", crop_name, e)
+        return raw_json_response(_ERR_DISEASES, 500)
 
-@api_bp.route('/crops/<crop_name>/fertilizer', methods=['GET'])
+@api_bp.route('/crops/<crop:crop_name>/fertilizer', methods=['GET'])
 def get_crop_fertilizer(crop_name):
     """Get fertilizer recommendations for a specific crop"""
     try:
-        # Validate crop
-        if not validate_crop(crop_name):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid crop: {crop_name}'
-            }), 400
-        
-        knowledge_base = AgriculturalKnowledgeBase()
-        
         # Check for specific growth stage
         growth_stage = request.args.get('stage', 'all')
         
-        fertilizer_info = knowledge_base.get_fertilizer_recommendation(crop_name, growth_stage)
+        body, etag, err = _crop_knowledge('get_fertilizer_recommendation', crop_name, growth_stage)
         
-        return jsonify({
-            'success': True,
-            'data': fertilizer_info
-        })
+        if err is not None:
+            return error_response(err, 404)
+        
+        return cached_json_response(body, etag, max_age=_KNOWLEDGE_MAX_AGE)
         
     except Exception as e:
-        logger.error(f"Error getting fertilizer info for {crop_name}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve fertilizer information'
-        }), 500
+        logger.exception("Error getting fertilizer info for %s: %s", crop_name, e)
+        return raw_json_response(_ERR_FERTILIZER, 500)
 
 @api_bp.route('/regions', methods=['GET'])
 def get_regions():
     """Get list of supported regions"""
-    try:
-        regions = [
-            'centre', 'littoral', 'west', 'northwest', 'southwest',
-            'east', 'north', 'far_north', 'adamawa', 'south'
-        ]
+    return cached_json_response(_REGIONS_BODY, _REGIONS_ETAG, max_age=_KNOWLEDGE_MAX_AGE)
+
+def _analysis_response(region: str, crop: str, include_forecast: bool):
+    """Serve a comprehensive analysis, reusing serialized bodies for repeat queries"""
+    use_msgpack = wants_msgpack()
+    cache_key = ('analysis', region, crop or '', include_forecast, use_msgpack)
+    cached = analysis_cache.get(cache_key)
+    
+    if cached is None:
+        analysis = current_app.data_coordinator.get_comprehensive_analysis(
+            region=region,
+            crop=crop,
+            include_forecast=include_forecast
+        )
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'regions': regions,
-                'total_count': len(regions)
-            }
-        })
+        err = analysis.get('error')
+        if err is not None:
+            return error_response(err, 500)
         
-    except Exception as e:
-        logger.error(f"Error getting regions: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve regions list'
-        }), 500
-
-@api_bp.route('/regions/<region_name>/weather', methods=['GET'])
+        # Forecast payloads are large: stream them section by section rather
+        # than holding a second, serialized copy in memory and in the cache
+        if include_forecast and not use_msgpack:
+            response = streamed_json_response(analysis)
+            response.vary.add('Accept')
+            return response
+        
+        # JSON bodies are stored with a gzipped copy so repeat hits cost no compression
+        if use_msgpack:
+            cached = packb({'success': True, 'data': analysis})
+        else:
+            cached = precompress(success_body(analysis))
+        analysis_cache.set(cache_key, cached)
+    
+    if use_msgpack:
+        response = Response(cached, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = negotiated_json_response(cached)
+    response.vary.add('Accept')
+    return response
+
+@api_bp.route('/regions/<region:region_name>/weather', methods=['GET'])
 def get_region_weather(region_name):
     """Get weather information for a specific region"""
     try:
-        # Validate region
-        if not validate_region(region_name):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid region: {region_name}'
-            }), 400
-        
-        # Get data coordinator from app context
-        data_coordinator = request.current_app.data_coordinator
-        
         # Get optional crop parameter
         crop = request.args.get('crop')
-        include_forecast = request.args.get('include_forecast', 'false').lower() == 'true'
+        include_forecast = request.args.get('include_forecast', '') in _TRUTHY
         
         # Get weather analysis
-        weather_analysis = data_coordinator.get_comprehensive_analysis(
-            region=region_name,
-            crop=crop,
-            include_forecast=include_forecast
-        )
-        
-        if 'error' in weather_analysis:
-            return jsonify({
-                'success': False,
-                'error': weather_analysis['error']
-            }), 500
-        
-        return jsonify({
-            'success': True,
-            'data': weather_analysis
-        })
+        return _analysis_response(region_name, crop, include_forecast)
         
     except APIServiceError as e:
-        logger.warning(f"API service error for weather in {region_name}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': f'Weather service temporarily unavailable: {str(e)}',
-            'error_type': 'api_service_error'
-        }), 503
+        logger.warning("API service error for weather in %s: %s", region_name, e)
+        return error_response(
+            f'Weather service temporarily unavailable: {str(e)}',
+            503,
+            error_type='api_service_error'
+        )
         
     except Exception as e:
-        logger.error(f"Error getting weather for {region_name}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve weather information'
-        }), 500
+        logger.exception("Error getting weather for %s: %s", region_name, e)
+        return raw_json_response(_ERR_WEATHER, 500)
 
 @api_bp.route('/analysis/comprehensive', methods=['GET'])
 def get_comprehensive_analysis():
-    """Get comprehensive agricultural analysis for region and crop"""
+    """Get comprehensive agricultural analysis for region and crop (JSON or MessagePack)"""
     try:
         # Get parameters
         region = request.args.get('region')
         crop = request.args.get('crop')
-        include_forecast = request.args.get('include_forecast', 'false').lower() == 'true'
+        include_forecast = request.args.get('include_forecast', '') in _TRUTHY
         
         if not region:
-            return jsonify({
-                'success': False,
-                'error': 'Region parameter is required'
-            }), 400
+            return raw_json_response(_ERR_REGION_REQUIRED, 400)
         
         # Validate region
         if not validate_region(region):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid region: {region}'
-            }), 400
+            return error_response(f'Invalid region: {region}', 400)
         
         # Validate crop if provided
         if crop and not validate_crop(crop):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid crop: {crop}'
-            }), 400
-        
-        # Get data coordinator
-        data_coordinator = request.current_app.data_coordinator
+            return error_response(f'Invalid crop: {crop}', 400)
         
         # Get comprehensive analysis
-        analysis = data_coordinator.get_comprehensive_analysis(
-            region=region,
-            crop=crop,
-            include_forecast=include_forecast
-        )
-        
-        if 'error' in analysis:
-            return jsonify({
-                'success': False,
-                'error': analysis['error']
-            }), 500
-        
-        return jsonify({
-            'success': True,
-            'data': analysis
-        })
+        return _analysis_response(region, crop, include_forecast)
         
     except APIServiceError as e:
-        logger.warning(f"API service error in comprehensive analysis: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': f'External data services temporarily unavailable: {str(e)}',
-            'error_type': 'api_service_error'
-        }), 503
+        logger.warning("API service error in comprehensive analysis: %s", e)
+        return error_response(
+            f'External data services temporarily unavailable: {str(e)}',
+            503,
+            error_type='api_service_error'
+        )
         
     except Exception as e:
-        logger.error(f"Error in comprehensive analysis: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve comprehensive analysis'
-        }), 500
+        logger.exception("Error in comprehensive analysis: %s", e)
+        return raw_json_response(_ERR_ANALYSIS, 500)
 
 @api_bp.route('/compare/regions', methods=['GET'])
 def compare_regions():
@@ -293,323 +289,311 @@ def compare_regions():
         crop = request.args.get('crop')
         
         if not regions_param:
-            return jsonify({
-                'success': False,
-                'error': 'Regions parameter is required (comma-separated list)'
-            }), 400
-        
-        # Parse regions
-        regions = [region.strip() for region in regions_param.split(',')]
-        
-        # Validate regions
-        for region in regions:
-            if not validate_region(region):
-                return jsonify({
-                    'success': False,
-                    'error': f'Invalid region: {region}'
-                }), 400
+            return raw_json_response(_ERR_REGIONS_REQUIRED, 400)
+        
+        # Parse regions in one pass, skipping empty entries and repeats
+        regions = list(dict.fromkeys(filter(None, _REGION_SPLIT.split(regions_param.strip()))))
+        
+        if not regions:
+            return raw_json_response(_ERR_REGIONS_REQUIRED, 400)
+        
+        # Validate regions, stopping at the first invalid one
+        invalid = next((region for region in regions if not validate_region(region)), None)
+        if invalid is not None:
+            return error_response(f'Invalid region: {invalid}', 400)
         
         # Validate crop if provided
         if crop and not validate_crop(crop):
-            return jsonify({
-                'success': False,
-                'error': f'Invalid crop: {crop}'
-            }), 400
-        
-        # Get data coordinator
-        data_coordinator = request.current_app.data_coordinator
+            return error_response(f'Invalid crop: {crop}', 400)
         
         # Compare regions
-        comparison = data_coordinator.get_multi_region_comparison(regions, crop)
+        cache_key = ('compare', tuple(regions), crop or '')
+        blobs = analysis_cache.get(cache_key)
         
-        return jsonify({
-            'success': True,
-            'data': comparison
-        })
+        if blobs is None:
+            comparison = current_app.data_coordinator.get_multi_region_comparison(regions, crop)
+            blobs = precompress(success_body(comparison))
+            analysis_cache.set(cache_key, blobs)
+        
+        return negotiated_json_response(blobs)
         
     except Exception as e:
-        logger.error(f"Error comparing regions: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to compare regions'
-        }), 500
+        logger.exception("Error comparing regions: %s", e)
+        return raw_json_response(_ERR_COMPARE, 500)
+
+@lru_cache(maxsize=1)
+def _public_summary_for_minute(minute_bucket: int) -> Tuple[dict, bytes]:
+    """Public summary payload and its JSON bytes, refreshed once per minute"""
+    # Aggregate metrics over 30 days barely move, so share them across workers (5 minutes)
+    public_metrics = cache.get(_ANALYTICS_SUMMARY_CACHE_KEY)
+    
+    if public_metrics is None:
+        from database.repositories.analytics_repository import AnalyticsRepository
+        
+        # Public metrics only, without the sensitive dashboard sections
+        public_metrics = AnalyticsRepository.get_public_summary(days=30)
+        cache.set(_ANALYTICS_SUMMARY_CACHE_KEY, public_metrics, timeout=300)
+    
+    payload = {
+        'success': True,
+        'data': public_metrics
+    }
+    return payload, dumps(payload)
 
 @api_bp.route('/analytics/summary', methods=['GET'])
 def get_analytics_summary():
-    """Get analytics summary (public metrics only)"""
+    """Get analytics summary (public metrics only; MessagePack via Accept: application/msgpack)"""
     try:
-        analytics_repo = AnalyticsRepository()
-        
-        # Get basic analytics without sensitive data
-        analytics = analytics_repo.get_comprehensive_analytics(days=30)
-        
-        # Filter to public metrics only
-        public_metrics = {
-            'total_conversations': analytics['overview']['total_conversations'],
-            'total_messages': analytics['overview']['total_messages'],
-            'average_rating': analytics['satisfaction']['avg_overall_rating'],
-            'satisfaction_rate': analytics['satisfaction']['satisfaction_rate'],
-            'period_days': analytics['period_days']
-        }
+        payload, body = _public_summary_for_minute(int(time.time() // 60))
         
-        return jsonify({
-            'success': True,
-            'data': public_metrics
-        })
+        if wants_msgpack():
+            return negotiated_response(payload)
+        
+        response = raw_json_response(body)
+        response.vary.add('Accept')
+        return response
         
     except Exception as e:
-        logger.error(f"Error getting analytics summary: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve analytics summary'
-        }), 500
+        logger.exception("Error getting analytics summary: %s", e)
+        return raw_json_response(_ERR_ANALYTICS, 500)
 
 # ============================================
 # KNOWLEDGE BASE ENDPOINTS FOR OFFLINE CACHING
 # ============================================
 
+# Static knowledge payloads are serialized and gzip-compressed once per worker;
+# cached_at records when they were built
+_KNOWLEDGE_BUILT_AT = datetime.utcnow()
+
+@lru_cache(maxsize=1)
+def _cached_at_for_minute(minute_bucket: int) -> datetime:
+    """Build the cached_at timestamp for a given minute bucket"""
+    return datetime.utcfromtimestamp(minute_bucket * 60)
+
+def _cached_at() -> datetime:
+    """Current cached_at timestamp, truncated to the minute"""
+    return _cached_at_for_minute(int(time.time() // 60))
+
+_BEST_PRACTICES = [
+    {
+        'topic': 'soil-preparation',
+        'title': 'Soil Preparation',
+        'practices': [
+            'Clear land of weeds and debris',
+            'Test soil pH and nutrients',
+            'Add organic matter/compost',
+            'Ensure proper drainage',
+            'Till soil to appropriate depth'
+        ]
+    },
+    {
+        'topic': 'planting',
+        'title': 'Planting Techniques',
+        'practices': [
+            'Plant at optimal spacing',
+            'Use quality seeds or seedlings',
+            'Plant at the right depth',
+            'Consider companion planting',
+            'Water immediately after planting'
+        ]
+    },
+    {
+        'topic': 'irrigation',
+        'title': 'Water Management',
+        'practices': [
+            'Water early morning or evening',
+            'Use drip irrigation when possible',
+            'Mulch to retain moisture',
+            'Avoid overwatering',
+            'Monitor soil moisture regularly'
+        ]
+    },
+    {
+        'topic': 'fertilization',
+        'title': 'Fertilizer Application',
+        'practices': [
+            'Use balanced NPK ratios',
+            'Apply organic fertilizers',
+            'Follow recommended rates',
+            'Time applications with growth stages',
+            'Avoid fertilizer burn'
+        ]
+    },
+    {
+        'topic': 'pest-management',
+        'title': 'Integrated Pest Management',
+        'practices': [
+            'Regular field monitoring',
+            'Use resistant varieties',
+            'Practice crop rotation',
+            'Employ biological control',
+            'Use pesticides as last resort'
+        ]
+    }
+]
+
+_SEASONAL_CALENDAR = {
+    'rainy_season': {
+        'months': ['March', 'April', 'May', 'June', 'July', 'August', 'September', 'October'],
+        'crops': ['Maize', 'Cassava', 'Plantain', 'Yam', 'Groundnut', 'Rice'],
+        'activities': ['Land preparation', 'Planting', 'Weeding', 'First harvest']
+    },
+    'dry_season': {
+        'months': ['November', 'December', 'January', 'February'],
+        'crops': ['Vegetables', 'Irrigated crops', 'Tree crops maintenance'],
+        'activities': ['Harvest storage crops', 'Irrigation management', 'Soil preparation']
+    }
+}
+
+# Static data for the generic knowledge categories
+_KNOWLEDGE_DATA = {
+    'pests': {
+        'items': [
+            {'name': 'Aphids', 'description': 'Small sap-sucking insects', 'control': 'Neem oil, insecticidal soap'},
+            {'name': 'Caterpillars', 'description': 'Larvae that eat leaves', 'control': 'Handpicking, Bt spray'},
+            {'name': 'Mites', 'description': 'Tiny spider-like pests', 'control': 'Water spray, predatory mites'}
+        ]
+    },
+    'soil-management': {
+        'items': [
+            {'topic': 'composting', 'description': 'Creating organic fertilizer from waste'},
+            {'topic': 'mulching', 'description': 'Covering soil to retain moisture'},
+            {'topic': 'cover-cropping', 'description': 'Growing crops to improve soil'}
+        ]
+    },
+    'irrigation': {
+        'items': [
+            {'method': 'Drip', 'efficiency': 'High', 'description': 'Water delivered directly to roots'},
+            {'method': 'Sprinkler', 'efficiency': 'Medium', 'description': 'Overhead water distribution'},
+            {'method': 'Furrow', 'efficiency': 'Low', 'description': 'Water flows in channels'}
+        ]
+    },
+    'fertilizers': {
+        'items': [
+            {'type': 'NPK', 'nutrients': 'Nitrogen, Phosphorus, Potassium', 'use': 'General growth'},
+            {'type': 'Compost', 'nutrients': 'Balanced organic', 'use': 'Soil improvement'},
+            {'type': 'Urea', 'nutrients': 'High nitrogen', 'use': 'Leaf growth'}
+        ]
+    },
+    'weather-tips': {
+        'items': [
+            {'condition': 'Drought', 'action': 'Mulch heavily, use drought-resistant varieties'},
+            {'condition': 'Heavy rain', 'action': 'Ensure drainage, protect young plants'},
+            {'condition': 'Wind', 'action': 'Stake tall plants, use windbreaks'}
+        ]
+    },
+    'market-info': {
+        'items': [
+            {'tip': 'Harvest at peak quality', 'benefit': 'Better prices'},
+            {'tip': 'Store properly', 'benefit': 'Reduced losses'},
+            {'tip': 'Know market days', 'benefit': 'Sell when demand is high'}
+        ]
+    }
+}
+
+def _static_knowledge_response(category, **data):
+    """Serialize a static knowledge payload alongside its gzip-compressed copy"""
+    return precompress(dumps({
+        'success': True,
+        **data,
+        'category': category,
+        'cached_at': _KNOWLEDGE_BUILT_AT
+    }))
+
+_BEST_PRACTICES_RESPONSE = _static_knowledge_response('best-practices', items=_BEST_PRACTICES)
+_SEASONAL_CALENDAR_RESPONSE = _static_knowledge_response('seasonal-calendar', items=_SEASONAL_CALENDAR)
+_CATEGORY_RESPONSES = {
+    category: _static_knowledge_response(category, **data)
+    for category, data in _KNOWLEDGE_DATA.items()
+}
+
 @api_bp.route('/knowledge/crops', methods=['GET'])
 def get_knowledge_crops():
     """Get all crops information for offline caching"""
     try:
-        knowledge_base = AgriculturalKnowledgeBase()
+        knowledge_base = _get_knowledge_base()
         crops = knowledge_base.get_all_crops()
 
-        return jsonify({
+        return json_response({
             'success': True,
             'items': crops,
             'category': 'crops',
-            'cached_at': datetime.utcnow().isoformat()
+            'cached_at': _cached_at()
         })
 
     except Exception as e:
-        logger.error(f"Error getting knowledge crops: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve crops knowledge'
-        }), 500
+        logger.exception("Error getting knowledge crops: %s", e)
+        return raw_json_response(_ERR_KNOWLEDGE_CROPS, 500)
+
+# Crops whose diseases are bundled for offline use
+_COMMON_DISEASE_CROPS = ('maize', 'cassava', 'cocoa', 'coffee', 'plantain')
 
 @api_bp.route('/knowledge/diseases', methods=['GET'])
 def get_knowledge_diseases():
     """Get all diseases information for offline caching"""
     try:
-        knowledge_base = AgriculturalKnowledgeBase()
+        knowledge_base = _get_knowledge_base()
         # Get diseases for common crops
-        common_crops = ['maize', 'cassava', 'cocoa', 'coffee', 'plantain']
         diseases = []
 
-        for crop in common_crops:
+        for crop in _COMMON_DISEASE_CROPS:
             crop_diseases = knowledge_base.get_disease_info(crop)
             if 'diseases' in crop_diseases:
                 for disease in crop_diseases['diseases']:
                     disease['crop'] = crop
                     diseases.append(disease)
 
-        return jsonify({
+        return json_response({
             'success': True,
             'items': diseases,
             'category': 'diseases',
-            'cached_at': datetime.utcnow().isoformat()
+            'cached_at': _cached_at()
         })
 
     except Exception as e:
-        logger.error(f"Error getting knowledge diseases: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve diseases knowledge'
-        }), 500
+        logger.exception("Error getting knowledge diseases: %s", e)
+        return raw_json_response(_ERR_KNOWLEDGE_DISEASES, 500)
 
 @api_bp.route('/knowledge/best-practices', methods=['GET'])
 def get_knowledge_best_practices():
     """Get agricultural best practices for offline caching"""
     try:
-        knowledge_base = AgriculturalKnowledgeBase()
-
-        practices = [
-            {
-                'topic': 'soil-preparation',
-                'title': 'Soil Preparation',
-                'practices': [
-                    'Clear land of weeds and debris',
-                    'Test soil pH and nutrients',
-                    'Add organic matter/compost',
-                    'Ensure proper drainage',
-                    'Till soil to appropriate depth'
-                ]
-            },
-            {
-                'topic': 'planting',
-                'title': 'Planting Techniques',
-                'practices': [
-                    'Plant at optimal spacing',
-                    'Use quality seeds or seedlings',
-                    'Plant at the right depth',
-                    'Consider companion planting',
-                    'Water immediately after planting'
-                ]
-            },
-            {
-                'topic': 'irrigation',
-                'title': 'Water Management',
-                'practices': [
-                    'Water early morning or evening',
-                    'Use drip irrigation when possible',
-                    'Mulch to retain moisture',
-                    'Avoid overwatering',
-                    'Monitor soil moisture regularly'
-                ]
-            },
-            {
-                'topic': 'fertilization',
-                'title': 'Fertilizer Application',
-                'practices': [
-                    'Use balanced NPK ratios',
-                    'Apply organic fertilizers',
-                    'Follow recommended rates',
-                    'Time applications with growth stages',
-                    'Avoid fertilizer burn'
-                ]
-            },
-            {
-                'topic': 'pest-management',
-                'title': 'Integrated Pest Management',
-                'practices': [
-                    'Regular field monitoring',
-                    'Use resistant varieties',
-                    'Practice crop rotation',
-                    'Employ biological control',
-                    'Use pesticides as last resort'
-                ]
-            }
-        ]
-
-        return jsonify({
-            'success': True,
-            'items': practices,
-            'category': 'best-practices',
-            'cached_at': datetime.utcnow().isoformat()
-        })
+        return negotiated_json_response(_BEST_PRACTICES_RESPONSE)
 
     except Exception as e:
-        logger.error(f"Error getting best practices: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve best practices'
-        }), 500
+        logger.exception("Error getting best practices: %s", e)
+        return raw_json_response(_ERR_BEST_PRACTICES, 500)
 
 @api_bp.route('/knowledge/seasonal-calendar', methods=['GET'])
 def get_knowledge_seasonal_calendar():
     """Get seasonal planting calendar for offline caching"""
     try:
-        calendar = {
-            'rainy_season': {
-                'months': ['March', 'April', 'May', 'June', 'July', 'August', 'September', 'October'],
-                'crops': ['Maize', 'Cassava', 'Plantain', 'Yam', 'Groundnut', 'Rice'],
-                'activities': ['Land preparation', 'Planting', 'Weeding', 'First harvest']
-            },
-            'dry_season': {
-                'months': ['November', 'December', 'January', 'February'],
-                'crops': ['Vegetables', 'Irrigated crops', 'Tree crops maintenance'],
-                'activities': ['Harvest storage crops', 'Irrigation management', 'Soil preparation']
-            }
-        }
-
-        return jsonify({
-            'success': True,
-            'items': calendar,
-            'category': 'seasonal-calendar',
-            'cached_at': datetime.utcnow().isoformat()
-        })
+        return negotiated_json_response(_SEASONAL_CALENDAR_RESPONSE)
 
     except Exception as e:
-        logger.error(f"Error getting seasonal calendar: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to retrieve seasonal calendar'
-        }), 500
+        logger.exception("Error getting seasonal calendar: %s", e)
+        return raw_json_response(_ERR_SEASONAL_CALENDAR, 500)
 
 @api_bp.route('/knowledge/<category>', methods=['GET'])
 def get_knowledge_category(category):
     """Generic endpoint for other knowledge categories"""
     try:
-        # Map categories to basic data
-        knowledge_data = {
-            'pests': {
-                'items': [
-                    {'name': 'Aphids', 'description': 'Small sap-sucking insects', 'control': 'Neem oil, insecticidal soap'},
-                    {'name': 'Caterpillars', 'description': 'Larvae that eat leaves', 'control': 'Handpicking, Bt spray'},
-                    {'name': 'Mites', 'description': 'Tiny spider-like pests', 'control': 'Water spray, predatory mites'}
-                ]
-            },
-            'soil-management': {
-                'items': [
-                    {'topic': 'composting', 'description': 'Creating organic fertilizer from waste'},
-                    {'topic': 'mulching', 'description': 'Covering soil to retain moisture'},
-                    {'topic': 'cover-cropping', 'description': 'Growing crops to improve soil'}
-                ]
-            },
-            'irrigation': {
-                'items': [
-                    {'method': 'Drip', 'efficiency': 'High', 'description': 'Water delivered directly to roots'},
-                    {'method': 'Sprinkler', 'efficiency': 'Medium', 'description': 'Overhead water distribution'},
-                    {'method': 'Furrow', 'efficiency': 'Low', 'description': 'Water flows in channels'}
-                ]
-            },
-            'fertilizers': {
-                'items': [
-                    {'type': 'NPK', 'nutrients': 'Nitrogen, Phosphorus, Potassium', 'use': 'General growth'},
-                    {'type': 'Compost', 'nutrients': 'Balanced organic', 'use': 'Soil improvement'},
-                    {'type': 'Urea', 'nutrients': 'High nitrogen', 'use': 'Leaf growth'}
-                ]
-            },
-            'weather-tips': {
-                'items': [
-                    {'condition': 'Drought', 'action': 'Mulch heavily, use drought-resistant varieties'},
-                    {'condition': 'Heavy rain', 'action': 'Ensure drainage, protect young plants'},
-                    {'condition': 'Wind', 'action': 'Stake tall plants, use windbreaks'}
-                ]
-            },
-            'market-info': {
-                'items': [
-                    {'tip': 'Harvest at peak quality', 'benefit': 'Better prices'},
-                    {'tip': 'Store properly', 'benefit': 'Reduced losses'},
-                    {'tip': 'Know market days', 'benefit': 'Sell when demand is high'}
-                ]
-            }
-        }
+        blobs = _CATEGORY_RESPONSES.get(category)
+        if blobs is None:
+            return error_response(f'Unknown knowledge category: {category}', 404)
 
-        if category in knowledge_data:
-            return jsonify({
-                'success': True,
-                **knowledge_data[category],
-                'category': category,
-                'cached_at': datetime.utcnow().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': f'Unknown knowledge category: {category}'
-            }), 404
+        return negotiated_json_response(blobs)
 
     except Exception as e:
-        logger.error(f"Error getting knowledge category {category}: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': f'Failed to retrieve {category} knowledge'
-        }), 500
+        logger.exception("Error getting knowledge category %s: %s", category, e)
+        return error_response(f'Failed to retrieve {category} knowledge', 500)
 
 @api_bp.errorhandler(404)
 def api_not_found(error):
     """Handle 404 errors for API routes"""
-    return jsonify({
-        'success': False,
-        'error': 'API endpoint not found'
-    }), 404
+    return raw_json_response(_ERR_NOT_FOUND, 404)
 
 @api_bp.errorhandler(405)
 def api_method_not_allowed(error):
     """Handle 405 errors for API routes"""
-    return jsonify({
-        'success': False,
-        'error': 'Method not allowed for this endpoint'
-    }), 405
\ No newline at end of file
+    return raw_json_response(_ERR_METHOD_NOT_ALLOWED, 405)
\ No newline at end of file
@@ -3,26 +3,150 @@
 Authentication routes for AgriBot user management system
 """
 
-from flask import Blueprint, request, jsonify, session, make_response
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import (
+    Blueprint, Response, abort, current_app, request, jsonify, session, make_response,
+    send_file, stream_with_context, url_for
+)
+from contextlib import contextmanager
 from functools import wraps
+from bisect import bisect_right
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, timedelta, timezone
 import csv
+import gc
+import heapq
+import hmac
 import io
 import logging
-from database.models.user import User, UserStatus
+import os
+import time
+from database.models.user import User, UserStatus, enum_value
 from database.models.conversation import Conversation
-from database.models.analytics import Analytics
 from database.repositories.analytics_repository import AnalyticsRepository
 from database import db
 from utils.validators import validate_email, validate_password
-from utils.exceptions import ValidationError
-from services.cache.simple_cache import cache_user_session
+from utils.passwords import hash_password, verify_password, needs_rehash
+from utils.exceptions import ValidationError, DatabaseError
+from utils.responses import json_response, raw_json_response
+from services.analytics_queue import analytics_events
+from services.export_jobs import export_jobs
+from services.cache.simple_cache import (
+    cache, cache_login, cache_account_type, get_cached_account_type, clear_cached_account_type
+)
 
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 logger = logging.getLogger(__name__)
 
+# Hash checked when the email is unknown, so login takes the same time
+# whether or not the account exists
+_DUMMY_PASSWORD_HASH = hash_password('agribot-dummy-password')
+
+# How often admin_required confirms a session's admin role against storage
+_ADMIN_RECHECK_SECONDS = 60
+
+# Column order of the ML dataset export
+_ML_DATASET_FIELDS = (
+    'conversation_id', 'message_id', 'timestamp', 'user_question', 'bot_response',
+    'intent', 'confidence_score', 'sentiment_score', 'entities', 'user_region',
+    'conversation_topic', 'mentioned_crops', 'has_image', 'image_filename', 'image_url',
+    'image_disease_detected', 'image_is_healthy', 'image_confidence', 'image_diseases_count',
+    'image_analysis_json', 'has_feedback', 'feedback_helpful', 'feedback_overall_rating',
+    'feedback_accuracy_rating', 'feedback_completeness_rating', 'feedback_comment',
+    'feedback_improvement_suggestion'
+)
+_ml_dataset_row = itemgetter(*_ML_DATASET_FIELDS)
+
+# Rows written per chunk by the streamed CSV exports
+_CSV_BATCH_ROWS = 500
+
+# Feedback can arrive a while after the conversation it rates
+_FEEDBACK_LATE_SLACK = timedelta(days=7)
+
+
+def _iter_csv(headers, rows):
+    """Yield CSV text in batches of rows, quoting fields like csv.writer"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    rows = iter(rows)
+    # writerows over a batch keeps the per-row work in C and sends
+    # fewer, larger chunks to the client
+    for batch in iter(lambda: list(islice(rows, _CSV_BATCH_ROWS)), []):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _iter_csv_dicts(rows):
+    """Yield CSV text for dict rows, taking the header from the first row"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=first.keys())
+    writer.writeheader()
+    writer.writerow(first)
+    for batch in iter(lambda: list(islice(rows, _CSV_BATCH_ROWS)), []):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while bulk-building export payloads"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _bot_replies_by_conversation(conversation_ids):
+    """Load bot messages for the given conversations in one query.
+
+    Returns {conversation_id: (timestamps, messages)} with both lists in
+    timestamp order, ready for bisecting.
+    """
+    from sqlalchemy.orm import load_only
+    from database.models.conversation import Message
+
+    replies = {}
+    if not conversation_ids:
+        return replies
+    bot_messages = Message.query.options(
+        load_only(Message.id, Message.conversation_id, Message.timestamp, Message.content)
+    ).filter(
+        Message.conversation_id.in_(conversation_ids),
+        Message.message_type == 'bot',
+        Message.timestamp.isnot(None)
+    ).order_by(Message.conversation_id, Message.timestamp.asc()).all()
+    for bot_msg in bot_messages:
+        timestamps, conv_messages = replies.setdefault(bot_msg.conversation_id, ([], []))
+        timestamps.append(bot_msg.timestamp)
+        conv_messages.append(bot_msg)
+    return replies
+
+
+def _next_bot_reply(replies, msg):
+    """Find the first bot message after msg in its conversation"""
+    timestamps, conv_messages = replies.get(msg.conversation_id, ((), ()))
+    if msg.timestamp is None:
+        return None
+    index = bisect_right(timestamps, msg.timestamp)
+    return conv_messages[index] if index < len(conv_messages) else None
+
 
 def safe_get_mentioned_crops(conv):
     """Safely return mentioned crops for a conversation, logging on errors.
@@ -41,7 +165,7 @@ def safe_get_mentioned_crops(conv):
         # Log minimal info to avoid sensitive data leaks
         logger.warning(f"Failed to parse mentioned_crops for conv_id={getattr(conv, 'id', 'unknown')}: {str(e)}")
         try:
-            Analytics.log_event('mentioned_crops_parse_error', {
+            analytics_events.log_event('mentioned_crops_parse_error', {
                 'conversation_id': getattr(conv, 'id', None),
                 'sample_value': (getattr(conv, 'mentioned_crops', None) and str(getattr(conv, 'mentioned_crops'))[:200])
             })
@@ -50,6 +174,94 @@ def safe_get_mentioned_crops(conv):
             pass
         return []
 
+def _count_crop_mentions(cutoff_date, previous_cutoff, region):
+    """Count crop mentions per period by decoding mentioned_crops in Python"""
+    from sqlalchemy.orm import load_only
+
+    # Load both periods in one query, fetching only the columns needed
+    # for counting; rows are split by start time
+    conv_query = Conversation.query.join(User).options(
+        load_only(Conversation.id, Conversation.start_time, Conversation.mentioned_crops)
+    ).filter(
+        Conversation.start_time >= previous_cutoff,
+        Conversation.mentioned_crops.isnot(None)
+    )
+    if region != 'all':
+        conv_query = conv_query.filter(User.region == region)
+
+    current_counts = {}
+    previous_counts = {}
+    for conv in conv_query.all():
+        counts = current_counts if conv.start_time >= cutoff_date else previous_counts
+        for crop in safe_get_mentioned_crops(conv):
+            crop_name = str(crop).lower()
+            counts[crop_name] = counts.get(crop_name, 0) + 1
+    return current_counts, previous_counts
+
+def _live_message_stats():
+    """Intent, hourly, confidence and sentiment totals queried from messages"""
+    from database.models.conversation import Message
+    from sqlalchemy import func
+
+    # Intent distribution
+    intents = db.session.query(
+        Message.intent_classification,
+        func.count(Message.id).label('count')
+    ).filter(Message.intent_classification.isnot(None)).group_by(Message.intent_classification).all()
+
+    # Hourly activity (messages per hour of day)
+    # SQLAlchemy compiles EXTRACT for each dialect (strftime on SQLite)
+    hourly_activity = db.session.query(
+        func.extract('hour', Message.timestamp).label('hour'),
+        func.count(Message.id).label('count')
+    ).group_by('hour').all()
+
+    # Response quality metrics
+    # PostgreSQL only rounds to a scale on numeric, not double precision
+    confidence_score = Message.confidence_score
+    if db.engine.dialect.name == 'postgresql':
+        confidence_score = db.cast(confidence_score, db.Numeric)
+    confidence_bucket = func.round(confidence_score, 1)
+    try:
+        confidence_distribution = db.session.query(
+            confidence_bucket.label('confidence'),
+            func.count(Message.id).label('count')
+        ).filter(Message.confidence_score.isnot(None)).group_by(confidence_bucket).all()
+        confidence = [(float(c[0]), c[1]) for c in confidence_distribution if c[0] is not None]
+    except Exception as e:
+        # Rollback transaction if query failed
+        db.session.rollback()
+        logger.warning(f"Confidence distribution query failed: {str(e)}")
+        confidence = []
+
+    # Sentiment distribution
+    try:
+        sentiment = tuple(db.session.query(
+            func.avg(Message.sentiment_score).label('avg_sentiment'),
+            func.count(Message.id).filter(Message.sentiment_score > 0).label('positive'),
+            func.count(Message.id).filter(Message.sentiment_score < 0).label('negative'),
+            func.count(Message.id).filter(Message.sentiment_score == 0).label('neutral')
+        ).first())
+    except Exception as e:
+        # Rollback transaction if query failed
+        db.session.rollback()
+        logger.warning(f"Sentiment distribution query failed: {str(e)}")
+        sentiment = (0, 0, 0, 0)
+
+    return {
+        'intents': [(i[0], i[1]) for i in intents],
+        'hourly': {int(h[0]): h[1] for h in hourly_activity if h[0] is not None},
+        'confidence': confidence,
+        'sentiment': sentiment
+    }
+
+@auth_bp.before_request
+def hide_debug_auth_endpoints():
+    """Answer 404 for the temp_* debugging endpoints unless ENABLE_DEBUG_AUTH is set"""
+    endpoint = request.endpoint or ''
+    if endpoint.startswith('auth.temp_') and not current_app.config.get('ENABLE_DEBUG_AUTH'):
+        abort(404)
+
 def login_required(f):
     """Decorator to require login for protected routes"""
     @wraps(f)
@@ -66,18 +278,83 @@ def admin_required(f):
         if 'user_id' not in session:
             return jsonify({'error': 'Authentication required'}), 401
 
-        user = User.get_by_id(session['user_id'])
-        if not user:
-            return jsonify({'error': 'User not found'}), 403
-
-        # Handle both enum and string values
-        account_type = user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
-        if account_type != 'admin':
+        # The signed session carries the role set at login
+        if session.get('account_type') != 'admin':
             return jsonify({'error': 'Admin privileges required'}), 403
 
+        # Re-check the stored role periodically so demoted or deleted
+        # admins lose access without logging out
+        now = time.time()
+        if now - session.get('admin_verified_at', 0) > _ADMIN_RECHECK_SECONDS:
+            # Account type is cached at login; fall back to the database on a miss
+            account_type = get_cached_account_type(session['user_id'])
+            if account_type is None:
+                user = User.get_by_id(session['user_id'])
+                if not user:
+                    return jsonify({'error': 'User not found'}), 403
+
+                # Handle both enum and string values
+                account_type = enum_value(user.account_type)
+                cache_account_type(user.id, account_type)
+
+            if account_type != 'admin':
+                session['account_type'] = account_type
+                return jsonify({'error': 'Admin privileges required'}), 403
+            session['admin_verified_at'] = now
+
         return f(*args, **kwargs)
     return decorated_function
 
+def cached_json(prefix, ttl=60, **params):
+    """Serve a JSON view from the shared cache, keyed on the given query args.
+
+    params maps each query argument to its default; only successful
+    responses are stored.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key_parts = [prefix]
+            for name, default in params.items():
+                value_type = type(default) if default is not None else None
+                key_parts.append(str(request.args.get(name, default, type=value_type)))
+            cache_key = ':'.join(key_parts)
+
+            body = cache.get(cache_key)
+            if body is not None:
+                return raw_json_response(body.encode('utf-8'))
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                cache.set(cache_key, response.get_data(as_text=True), timeout=ttl)
+            return response
+        return decorated_function
+    return decorator
+
+def queueable_export(f):
+    """Run an export view in the background when called with ?async=1.
+
+    The request answers 202 with a job id; the finished file is served by
+    export_job_download.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.args.get('async') != '1':
+            return f(*args, **kwargs)
+
+        query_string = request.args.to_dict(flat=False)
+        query_string.pop('async', None)
+        job_id = export_jobs.submit(
+            f, request.path, query_string,
+            base_url=request.host_url, user_id=session.get('user_id')
+        )
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': url_for('auth.export_job_status', job_id=job_id)
+        }), 202
+    return decorated_function
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Register a new user account"""
@@ -119,7 +396,7 @@ def register():
         user_data = {
             'name': data['name'].strip(),
             'email': data['email'].lower().strip(),
-            'password_hash': generate_password_hash(data['password']),
+            'password_hash': hash_password(data['password']),
             'phone': data.get('phone', '').strip(),
             'region': data['region'],
             'account_type': data['account_type'],
@@ -130,10 +407,10 @@ def register():
         user = User.create(user_data)
 
         # Log registration event
-        Analytics.log_event('user_registration', {
+        analytics_events.log_event('user_registration', {
             'user_id': user.id,
-            'account_type': user.account_type.value if hasattr(user.account_type, 'value') else user.account_type,
-            'region': user.region.value if hasattr(user.region, 'value') else user.region
+            'account_type': enum_value(user.account_type),
+            'region': user.region
         }, user_id=user.id)
         
         return jsonify({
@@ -163,34 +440,40 @@ def login():
         # Get user by email
         user = User.get_by_email(email)
         if not user:
+            verify_password(_DUMMY_PASSWORD_HASH, password)
             return jsonify({'error': 'Invalid credentials'}), 401
 
         # Verify password
-        if not check_password_hash(user.password_hash, password):
+        if not verify_password(user.password_hash, password):
             return jsonify({'error': 'Invalid credentials'}), 401
 
         # Check account type matches (handle both enum and string)
-        user_account_type = user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
-        if user_account_type != account_type:
+        user_account_type = enum_value(user.account_type)
+        if not hmac.compare_digest(str(user_account_type).encode('utf-8'), str(account_type).encode('utf-8')):
             return jsonify({'error': 'Invalid account type'}), 401
 
         # Check if account is active (handle both enum and string, default to active if no status)
         if hasattr(user, 'status'):
-            user_status = user.status.value if hasattr(user.status, 'value') else user.status
+            user_status = enum_value(user.status)
             if user_status != 'active':
                 return jsonify({'error': 'Account is not active'}), 401
         
+        # Upgrade legacy password hashes; saved with the last-login update
+        if needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+        
         # Update last login
         User.update_last_login(user.id)
         
         # Create session
         session['user_id'] = user.id
         session['account_type'] = user.account_type.value
+        session.pop('admin_verified_at', None)
         session['login_time'] = datetime.now(timezone.utc).isoformat()
         
-        # Cache session data for quick access
+        # Cache session data and account type in one round-trip
         try:
-            cache_user_session(user.id, {
+            cache_login(user.id, {
                 'name': user.name,
                 'email': user.email,
                 'region': user.region,  # Now string
@@ -202,7 +485,7 @@ def login():
         
         # Log login event
         try:
-            Analytics.log_event('user_login', {
+            analytics_events.log_event('user_login', {
                 'user_id': user.id,
                 'account_type': user.account_type.value
             })
@@ -243,7 +526,7 @@ def logout():
         
         # Log logout event
         if user_id:
-            Analytics.log_event('user_logout', {'user_id': user_id})
+            analytics_events.log_event('user_logout', {'user_id': user_id})
         
         # Clear session
         session.clear()
@@ -337,15 +620,17 @@ def get_all_users():
             search=search
         )
         
+        # Conversation counts for the whole page in one query
+        conv_counts = Conversation.count_by_users([user.id for user in users])
+        
         users_data = []
         for user in users:
-            # Get conversation count for each user
-            conv_count = Conversation.count_by_user(user.id)
+            conv_count = conv_counts.get(user.id, 0)
 
             # Handle Enum values properly
-            region_val = user.region.value if hasattr(user.region, 'value') else user.region
-            account_type_val = user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
-            status_val = user.status.value if hasattr(user.status, 'value') else user.status
+            region_val = user.region
+            account_type_val = enum_value(user.account_type)
+            status_val = enum_value(user.status)
 
             users_data.append({
                 'id': user.id,
@@ -395,6 +680,7 @@ def update_user(user_id):
         
         # Update user
         User.update(user_id, update_data)
+        clear_cached_account_type(user_id)
         
         return jsonify({
             'success': True,
@@ -415,9 +701,10 @@ def delete_user(user_id):
         
         # Soft delete - mark as inactive instead of removing
         User.update(user_id, {'status': 'deleted'})
+        clear_cached_account_type(user_id)
         
         # Log deletion event
-        Analytics.log_event('user_deletion', {
+        analytics_events.log_event('user_deletion', {
             'deleted_user_id': user_id,
             'admin_user_id': session['user_id']
         })
@@ -441,58 +728,59 @@ def export_users():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        users = User.get_for_export(
+        # Users and their conversation counts in one query, read in batches
+        rows = User.iter_export_rows(
             region=region,
             status=status,
             start_date=start_date,
             end_date=end_date
         )
+        admin_user_id = session['user_id']
         
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
         headers = [
             'ID', 'Name', 'Email', 'Phone', 'Region', 'Account Type',
             'Status', 'Conversations', 'Created At', 'Last Login'
         ]
-        writer.writerow(headers)
-        
-        # Write data
-        for user in users:
-            conv_count = Conversation.count_by_user(user.id)
-            writer.writerow([
-                user.id,
-                user.name,
-                user.email,
-                user.phone or '',
-                user.region,
-                user.account_type,
-                user.status,
-                conv_count,
-                user.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else ''
-            ])
         
-        # Log export event
-        Analytics.log_event('data_export', {
-            'admin_user_id': session['user_id'],
-            'export_type': 'users',
-            'record_count': len(users)
-        })
+        def generate_rows():
+            record_count = 0
+            for (user_id, name, email, phone, user_region, account_type, user_status,
+                 conv_count, created_at, last_login) in rows:
+                record_count += 1
+                yield [
+                    user_id,
+                    name,
+                    email,
+                    phone or '',
+                    user_region,
+                    enum_value(account_type),
+                    enum_value(user_status),
+                    conv_count,
+                    created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    last_login.strftime('%Y-%m-%d %H:%M:%S') if last_login else ''
+                ]
+            
+            # Log export event once the row count is known
+            analytics_events.log_event('data_export', {
+                'admin_user_id': admin_user_id,
+                'export_type': 'users',
+                'record_count': record_count
+            })
         
-        return {
-            'csv_data': output.getvalue(),
-            'filename': f'users_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-            'record_count': len(users)
-        }
+        # Stream rows to the client as they are written
+        filename = f'users_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        return Response(
+            stream_with_context(_iter_csv(headers, generate_rows())),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
         
     except Exception as e:
         return jsonify({'error': 'Export failed'}), 500
 
 @auth_bp.route('/admin/analytics/overview', methods=['GET'])
 @admin_required
+@cached_json('analytics:overview', ttl=300, days=30, region='all')
 def get_analytics_overview():
     """Get analytics overview for dashboard"""
     try:
@@ -500,29 +788,9 @@ def get_analytics_overview():
         days = request.args.get('days', 30, type=int)
         region = request.args.get('region', 'all')
 
-        # Create cache key for this query
-        cache_key = f"analytics_overview_{days}_{region}"
-
-        # Try to get from cache first (5 minute cache)
-        try:
-            from services.cache.simple_cache import cache
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info(f"Returning cached analytics overview for {cache_key}")
-                return jsonify(cached_data)
-        except:
-            # Cache might not be available, continue without it
-            pass
-
         # Use the enhanced analytics repository with region filter
         analytics_data = AnalyticsRepository.get_comprehensive_analytics(days, region)
 
-        # Cache the result for 5 minutes
-        try:
-            cache.set(cache_key, analytics_data, timeout=300)
-        except:
-            pass
-
         return jsonify(analytics_data)
 
     except Exception as e:
@@ -531,6 +799,7 @@ def get_analytics_overview():
 
 @auth_bp.route('/admin/analytics/regional-distribution', methods=['GET'])
 @admin_required
+@cached_json('analytics:regional-distribution', country=None)
 def get_regional_distribution():
     """Get regional distribution of users grouped by country"""
     try:
@@ -561,8 +830,7 @@ def get_regional_distribution():
 
             # Normalize country and region names
             country_name = str(country).strip()
-            region_name = region.value if hasattr(region, 'value') else region
-            region_name = str(region_name).strip().title().replace('_', ' ').replace('-', ' ')
+            region_name = str(region).strip().title().replace('_', ' ').replace('-', ' ')
 
             if country_name not in distribution_by_country:
                 distribution_by_country[country_name] = {}
@@ -609,58 +877,36 @@ def get_analytics_countries():
 
 @auth_bp.route('/admin/analytics/crop-inquiries', methods=['GET'])
 @admin_required
+@cached_json('analytics:crop-inquiries', days=7, region='all')
 def get_crop_inquiries():
     """Get crop inquiry statistics"""
     try:
-        from sqlalchemy import func
-        from database.models.conversation import Conversation, Message
-        from database.models.user import User
-        import json
-
         days = request.args.get('days', 7, type=int)
         region = request.args.get('region', 'all')
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        # Build base query with region filter
-        conv_query = Conversation.query.join(User).filter(
-            Conversation.start_time >= cutoff_date,
-            Conversation.mentioned_crops.isnot(None)
-        )
-        if region != 'all':
-            conv_query = conv_query.filter(User.region == region)
-
-        # Get all conversations with mentioned crops
-        conversations = conv_query.all()
-
-        # Count crop mentions for current period
-        crop_counts = {}
-        for conv in conversations:
-            crops = safe_get_mentioned_crops(conv)
-            for crop in crops:
-                crop_name = str(crop).lower().capitalize()
-                crop_counts[crop_name] = crop_counts.get(crop_name, 0) + 1
-
-        # Get previous period data for trend calculation
         previous_cutoff = cutoff_date - timedelta(days=days)
-        prev_conv_query = Conversation.query.join(User).filter(
-            Conversation.start_time >= previous_cutoff,
-            Conversation.start_time < cutoff_date,
-            Conversation.mentioned_crops.isnot(None)
-        )
-        if region != 'all':
-            prev_conv_query = prev_conv_query.filter(User.region == region)
 
-        previous_conversations = prev_conv_query.all()
+        # Count in the database; decode in Python if the JSON functions are
+        # unavailable or a row holds malformed JSON
+        counts = None
+        try:
+            counts = AnalyticsRepository.get_crop_mention_counts(cutoff_date, previous_cutoff, region)
+        except DatabaseError as e:
+            logger.warning("Crop mention aggregation fell back to Python: %s", e)
 
+        if counts is None:
+            counts = _count_crop_mentions(cutoff_date, previous_cutoff, region)
+
+        crop_counts = {}
         previous_crop_counts = {}
-        for conv in previous_conversations:
-            crops = safe_get_mentioned_crops(conv)
-            for crop in crops:
+        for source, target in zip(counts, (crop_counts, previous_crop_counts)):
+            for crop, count in source.items():
                 crop_name = str(crop).lower().capitalize()
-                previous_crop_counts[crop_name] = previous_crop_counts.get(crop_name, 0) + 1
+                target[crop_name] = target.get(crop_name, 0) + count
 
         # Sort by count and get top crops
-        sorted_crops = sorted(crop_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        sorted_crops = heapq.nlargest(10, crop_counts.items(), key=lambda x: x[1])
 
         crop_data = []
         for crop, count in sorted_crops:
@@ -695,6 +941,7 @@ def get_crop_inquiries():
 
 @auth_bp.route('/admin/analytics/activity-trends', methods=['GET'])
 @admin_required
+@cached_json('analytics:activity-trends', days=7, region='all')
 def get_activity_trends():
     """Get user activity trends over time"""
     try:
@@ -704,43 +951,35 @@ def get_activity_trends():
 
         days = request.args.get('days', 7, type=int)
         region = request.args.get('region', 'all')
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        # Generate date labels
-        date_labels = []
-        for i in range(days):
-            date = datetime.utcnow() - timedelta(days=days-i-1)
-            date_labels.append(date.strftime('%a'))
-
-        # Get new users per day
-        new_users_data = []
-        for i in range(days):
-            start_date = datetime.utcnow() - timedelta(days=days-i)
-            end_date = start_date + timedelta(days=1)
-
-            user_query = User.query.filter(
-                User.created_at >= start_date,
-                User.created_at < end_date
-            )
-            if region != 'all':
-                user_query = user_query.filter(User.region == region)
+        # One bucket per calendar day (UTC), ending today
+        today = datetime.utcnow().date()
+        day_list = [today - timedelta(days=days - i - 1) for i in range(days)]
+        start_date = datetime.combine(day_list[0], datetime.min.time()) if day_list else datetime.utcnow()
 
-            new_users_data.append(user_query.count())
-
-        # Get conversations per day
-        conversations_data = []
-        for i in range(days):
-            start_date = datetime.utcnow() - timedelta(days=days-i)
-            end_date = start_date + timedelta(days=1)
+        # Generate date labels
+        date_labels = [day.strftime('%a') for day in day_list]
 
-            conv_query = Conversation.query.join(User).filter(
-                Conversation.start_time >= start_date,
-                Conversation.start_time < end_date
-            )
-            if region != 'all':
-                conv_query = conv_query.filter(User.region == region)
+        # Get new users per day in one grouped query
+        user_day = func.date(User.created_at)
+        user_query = db.session.query(user_day, func.count(User.id))\
+            .filter(User.created_at >= start_date)
+        if region != 'all':
+            user_query = user_query.filter(User.region == region)
+        users_by_day = {str(day): count for day, count in user_query.group_by(user_day).all()}
+
+        # Get conversations per day in one grouped query
+        conv_day = func.date(Conversation.start_time)
+        conv_query = db.session.query(conv_day, func.count(Conversation.id))\
+            .join(User, Conversation.user_id == User.id)\
+            .filter(Conversation.start_time >= start_date)
+        if region != 'all':
+            conv_query = conv_query.filter(User.region == region)
+        conversations_by_day = {str(day): count for day, count in conv_query.group_by(conv_day).all()}
 
-            conversations_data.append(conv_query.count())
+        # Fill days without activity with zeros
+        new_users_data = [users_by_day.get(day.isoformat(), 0) for day in day_list]
+        conversations_data = [conversations_by_day.get(day.isoformat(), 0) for day in day_list]
 
         return jsonify({
             'success': True,
@@ -755,6 +994,7 @@ def get_activity_trends():
 
 @auth_bp.route('/admin/export/ml-dataset', methods=['GET'])
 @admin_required
+@queueable_export
 def export_ml_dataset():
     """
     Export comprehensive ML training dataset
@@ -771,6 +1011,7 @@ def export_ml_dataset():
     Perfect for training agricultural chatbot ML models
     """
     try:
+        from sqlalchemy.orm import contains_eager, load_only
         from database.models.conversation import Message
         from database.models.analytics import Feedback
 
@@ -781,10 +1022,15 @@ def export_ml_dataset():
         min_confidence = request.args.get('min_confidence', type=float)
 
         # Build query
-        query = db.session.query(Message).join(Conversation)
+        # Conversations come from the same join rather than one lazy load each
+        query = db.session.query(Message).join(Conversation).options(
+            contains_eager(Message.conversation)
+        )
 
+        start_datetime = end_datetime = None
         if start_date:
-            query = query.filter(Message.timestamp >= datetime.fromisoformat(start_date))
+            start_datetime = datetime.fromisoformat(start_date)
+            query = query.filter(Message.timestamp >= start_datetime)
         if end_date:
             # Include the entire end date by adding 23:59:59
             end_datetime = datetime.fromisoformat(end_date)
@@ -797,6 +1043,12 @@ def export_ml_dataset():
 
         messages = query.order_by(Message.timestamp.asc()).all()
 
+        # Pre-load bot replies for every conversation in one query, instead
+        # of one lookup per user message
+        bot_replies = _bot_replies_by_conversation(
+            {m.conversation_id for m in messages if m.message_type == 'user'}
+        )
+
         # Debug: Count messages with images
         image_messages = [m for m in messages if m.has_image]
         logger.info(f"Total messages: {len(messages)}, Messages with images: {len(image_messages)}")
@@ -804,11 +1056,22 @@ def export_ml_dataset():
             logger.info(f"Image message IDs: {[m.id for m in image_messages]}")
             logger.info(f"Image message timestamps: {[m.timestamp.isoformat() for m in image_messages]}")
 
-        # Pre-load all feedback organized by conversation AND by user
-        all_feedback = Feedback.query.all()
+        # Pre-load feedback from the export's date window, organized by
+        # conversation AND by user. conversation_id may hold frontend session
+        # ids (VARCHAR in production), so it is not filtered on here.
+        user_messages = [m for m in messages if m.message_type == 'user']
+        feedback_query = Feedback.query.options(load_only(
+            Feedback.conversation_id, Feedback.user_id, Feedback.timestamp,
+            Feedback.helpful, Feedback.overall_rating, Feedback.accuracy_rating,
+            Feedback.completeness_rating, Feedback.comment, Feedback.improvement_suggestion
+        ))
+        if start_datetime:
+            feedback_query = feedback_query.filter(Feedback.timestamp >= start_datetime)
+        if end_datetime:
+            feedback_query = feedback_query.filter(Feedback.timestamp <= end_datetime + _FEEDBACK_LATE_SLACK)
         feedback_by_conv = {}
         feedback_by_user = {}
-        for fb in all_feedback:
+        for fb in (feedback_query.yield_per(1000) if user_messages else ()):
             # Group feedback by conversation_id (integer database ID)
             if fb.conversation_id not in feedback_by_conv:
                 feedback_by_conv[fb.conversation_id] = []
@@ -819,45 +1082,49 @@ def export_ml_dataset():
                 feedback_by_user[fb.user_id] = []
             feedback_by_user[fb.user_id].append(fb)
 
-        # Build dataset
-        dataset = []
-        for msg in messages:
-            # Get conversation context
-            conv = msg.conversation
-
-            # Get feedback for this conversation if available
-            # Strategy 1: Try to match by conversation's database ID to feedback's conversation_id
-            # Strategy 2: Fallback to matching by user_id
-            feedback = None
-            if conv and conv.id and conv.id in feedback_by_conv:
-                # Get the most recent feedback for this conversation
-                conv_feedbacks = feedback_by_conv[conv.id]
-                if conv_feedbacks:
-                    # Sort by timestamp and get the most recent
-                    conv_feedbacks.sort(key=lambda f: f.timestamp if f.timestamp else datetime.min, reverse=True)
-                    feedback = conv_feedbacks[0]
-            elif conv and conv.user_id and conv.user_id in feedback_by_user:
-                # Fallback: Get feedback by user_id if session_id doesn't match
-                user_feedbacks = feedback_by_user[conv.user_id]
-                if user_feedbacks:
+        # Most recent feedback per conversation, picked once
+        latest_feedback_by_conv = {
+            conv_id: max(conv_feedbacks, key=lambda f: f.timestamp if f.timestamp else datetime.min)
+            for conv_id, conv_feedbacks in feedback_by_conv.items()
+        }
+
+        # Base URL for image links
+        base_url = request.url_root.rstrip('/')
+
+        # Build dataset entries lazily so the CSV can be streamed; only
+        # user messages produce entries, paired with the bot's reply
+        def iter_entries(flatten=False):
+            for msg in user_messages:
+                # Get conversation context
+                conv = msg.conversation
+
+                # Get feedback for this conversation if available
+                # Strategy 1: Try to match by conversation's database ID to feedback's conversation_id
+                # Strategy 2: Fallback to matching by user_id
+                feedback = None
+                if conv and conv.id and conv.id in feedback_by_conv:
+                    # Get the most recent feedback for this conversation
+                    feedback = latest_feedback_by_conv[conv.id]
+                elif conv and conv.user_id and conv.user_id in feedback_by_user:
+                    # Fallback: Get feedback by user_id if session_id doesn't match
+                    user_feedbacks = feedback_by_user[conv.user_id]
                     # Find feedback closest in time to this message
-                    user_feedbacks.sort(key=lambda f: abs((f.timestamp - msg.timestamp).total_seconds()) if f.timestamp else float('inf'))
-                    feedback = user_feedbacks[0]
+                    feedback = min(user_feedbacks, key=lambda f: abs((f.timestamp - msg.timestamp).total_seconds()) if f.timestamp else float('inf'))
 
-            # Get paired user-bot exchanges
-            if msg.message_type == 'user':
                 # Find the bot's response
-                bot_response = Message.query.filter(
-                    Message.conversation_id == msg.conversation_id,
-                    Message.message_type == 'bot',
-                    Message.timestamp > msg.timestamp
-                ).order_by(Message.timestamp.asc()).first()
+                bot_response = _next_bot_reply(bot_replies, msg)
 
-                # Get image analysis if present
+                # Get image analysis if present, reading its fields once
                 image_analysis = msg.get_image_analysis() if msg.has_image else None
+                if image_analysis:
+                    image_diseases = image_analysis.get('diseases') or []
+                    image_is_healthy = image_analysis.get('is_healthy')
+                    image_confidence = f"{image_analysis.get('confidence', 0) * 100:.1f}%"
+                else:
+                    image_diseases, image_is_healthy, image_confidence = [], False, ''
 
-                # Get base URL for image links
-                base_url = request.url_root.rstrip('/') if request else 'http://localhost:5000'
+                entities = msg.get_entities()
+                mentioned_crops = list(safe_get_mentioned_crops(conv)) if conv else []
 
                 dataset_entry = {
                     'conversation_id': msg.conversation_id,
@@ -868,19 +1135,21 @@ def export_ml_dataset():
                     'intent': msg.intent_classification,
                     'confidence_score': msg.confidence_score,
                     'sentiment_score': msg.sentiment_score,
-                    'entities': msg.get_entities(),
+                    # CSV rows flatten the nested fields to text
+                    'entities': str(entities) if flatten else entities,
                     'user_region': conv.region if conv else None,
                     'conversation_topic': conv.current_topic if conv else None,
-                    'mentioned_crops': list(safe_get_mentioned_crops(conv)) if conv else [],
+                    'mentioned_crops': ','.join(mentioned_crops) if flatten else mentioned_crops,
                     # Image fields - NEW
                     'has_image': 'Yes' if msg.has_image else 'No',
                     'image_filename': msg.image_filename if msg.has_image else '',
                     'image_url': f"{base_url}{msg.image_url}" if msg.has_image and msg.image_url else '',
-                    'image_disease_detected': 'Yes' if (image_analysis and image_analysis.get('diseases')) else 'No',
-                    'image_is_healthy': 'Yes' if (image_analysis and image_analysis.get('is_healthy')) else 'No',
-                    'image_confidence': f"{image_analysis.get('confidence', 0) * 100:.1f}%" if image_analysis else '',
-                    'image_diseases_count': len(image_analysis.get('diseases', [])) if image_analysis else 0,
-                    'image_analysis_json': str(image_analysis) if image_analysis else '',
+                    'image_disease_detected': 'Yes' if image_diseases else 'No',
+                    'image_is_healthy': 'Yes' if image_is_healthy else 'No',
+                    'image_confidence': image_confidence,
+                    'image_diseases_count': len(image_diseases),
+                    # Stored column is already JSON; reuse it rather than re-encoding
+                    'image_analysis_json': msg.image_analysis if image_analysis else '',
                     # Feedback fields - will be empty for messages without feedback
                     'has_feedback': 'Yes' if feedback else 'No',
                     'feedback_helpful': feedback.helpful if feedback else '',
@@ -890,43 +1159,44 @@ def export_ml_dataset():
                     'feedback_comment': feedback.comment if feedback else '',
                     'feedback_improvement_suggestion': feedback.improvement_suggestion if feedback else ''
                 }
-                dataset.append(dataset_entry)
+                yield dataset_entry
 
         # Format response
         if format_type == 'csv':
-            # Convert to CSV
-            output = io.StringIO()
-            if dataset:
-                writer = csv.DictWriter(output, fieldnames=dataset[0].keys())
-                writer.writeheader()
-                for row in dataset:
-                    # Flatten nested structures for CSV
-                    row_copy = row.copy()
-                    row_copy['entities'] = str(row_copy['entities'])
-                    row_copy['mentioned_crops'] = ','.join(row_copy['mentioned_crops']) if row_copy['mentioned_crops'] else ''
-                    writer.writerow(row_copy)
+            if user_messages:
+                # Positional rows in a fixed column order for csv.writer
+                body = _iter_csv(_ML_DATASET_FIELDS, map(_ml_dataset_row, iter_entries(flatten=True)))
             else:
                 # Return empty CSV with message
-                output.write("# No data found for the selected date range\n")
-                output.write("# Try expanding your date range or removing filters\n")
+                body = iter(["# No data found for the selected date range\n"
+                             "# Try expanding your date range or removing filters\n"])
 
-            from flask import Response
+            # Stream rows to the client as they are written
             return Response(
-                output.getvalue(),
+                stream_with_context(body),
                 mimetype='text/csv',
                 headers={'Content-Disposition': f'attachment;filename=agribot_ml_dataset_{datetime.now().strftime("%Y%m%d")}.csv'}
             )
         else:
             # Return JSON
-            return jsonify({
+            with _gc_paused():
+                dataset = list(iter_entries())
+
+            # Table totals for the metadata in one round-trip
+            total_conversations, total_messages, feedback_count = db.session.query(
+                db.session.query(db.func.count(Conversation.id)).scalar_subquery(),
+                db.session.query(db.func.count(Message.id)).scalar_subquery(),
+                db.session.query(db.func.count(Feedback.id)).scalar_subquery()
+            ).one()
+            return json_response({
                 'success': True,
                 'dataset_size': len(dataset),
                 'export_date': datetime.now(timezone.utc).isoformat(),
                 'data': dataset,
                 'metadata': {
-                    'total_conversations': Conversation.query.count(),
-                    'total_messages': Message.query.count(),
-                    'feedback_count': Feedback.query.count(),
+                    'total_conversations': total_conversations,
+                    'total_messages': total_messages,
+                    'feedback_count': feedback_count,
                     'date_range': {
                         'start': start_date or 'all',
                         'end': end_date or 'all'
@@ -935,14 +1205,44 @@ def export_ml_dataset():
             })
 
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"ML dataset export error: {str(e)}\n{error_trace}")
-        return jsonify({'error': 'Failed to export ML dataset', 'details': str(e), 'trace': error_trace}), 500
+        logger.exception(f"ML dataset export error: {str(e)}")
+        return jsonify({'error': 'Failed to export ML dataset'}), 500
 
 
+@auth_bp.route('/admin/export/status/<job_id>', methods=['GET'])
+@admin_required
+def export_job_status(job_id):
+    """Get the state of a background export"""
+    job = export_jobs.get(job_id, user_id=session.get('user_id'))
+    if not job:
+        return jsonify({'error': 'Export job not found'}), 404
+
+    result = {'success': True, 'job_id': job_id, 'status': job['status']}
+    if job['status'] == 'done':
+        result['download_url'] = url_for('auth.export_job_download', job_id=job_id)
+    elif job['status'] == 'failed':
+        # The cause is in the server log
+        result['error'] = 'Export failed'
+    return jsonify(result)
+
+@auth_bp.route('/admin/export/download/<job_id>', methods=['GET'])
+@admin_required
+def export_job_download(job_id):
+    """Download the output of a finished background export"""
+    job = export_jobs.get(job_id, user_id=session.get('user_id'))
+    path = export_jobs.file_path(job_id)
+    if not job or job['status'] != 'done' or not os.path.exists(path):
+        return jsonify({'error': 'Export not available'}), 404
+
+    output = job['result']
+    response = send_file(path, mimetype=output['mimetype'])
+    if output.get('content_disposition'):
+        response.headers['Content-Disposition'] = output['content_disposition']
+    return response
+
 @auth_bp.route('/admin/export/feedback-dataset', methods=['GET'])
 @admin_required
+@queueable_export
 def export_feedback_dataset():
     """
     Export feedback data for supervised learning
@@ -954,45 +1254,38 @@ def export_feedback_dataset():
         from database.models.analytics import Feedback
         from database.models.conversation import Message
 
-        feedbacks = Feedback.query.all()
-
-        dataset = []
-        for fb in feedbacks:
-            # Export feedback data directly
-            # Note: conversation_id in feedback is session_id from frontend
-            dataset.append({
-                'feedback_id': fb.id,
-                'session_id': fb.conversation_id,  # This is the frontend session ID
-                'user_id': fb.user_id,
-                'helpful': fb.helpful,
-                'overall_rating': fb.overall_rating,
-                'accuracy_rating': fb.accuracy_rating,
-                'completeness_rating': fb.completeness_rating,
-                'comment': fb.comment,
-                'improvement_suggestion': fb.improvement_suggestion,
-                'timestamp': fb.timestamp.isoformat() if fb.timestamp else None
-            })
+        def iter_feedback():
+            # Read feedback in batches rather than all at once
+            for fb in Feedback.query.yield_per(1000):
+                # Export feedback data directly
+                # Note: conversation_id in feedback is session_id from frontend
+                yield {
+                    'feedback_id': fb.id,
+                    'session_id': fb.conversation_id,  # This is the frontend session ID
+                    'user_id': fb.user_id,
+                    'helpful': fb.helpful,
+                    'overall_rating': fb.overall_rating,
+                    'accuracy_rating': fb.accuracy_rating,
+                    'completeness_rating': fb.completeness_rating,
+                    'comment': fb.comment,
+                    'improvement_suggestion': fb.improvement_suggestion,
+                    'timestamp': fb.timestamp.isoformat() if fb.timestamp else None
+                }
 
         # Get format type
         format_type = request.args.get('format', 'json')
 
         if format_type == 'csv':
-            # Convert to CSV
-            import io
-            import csv
-
-            output = io.StringIO()
-            if dataset:
-                writer = csv.DictWriter(output, fieldnames=dataset[0].keys())
-                writer.writeheader()
-                writer.writerows(dataset)
-
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename=feedback_dataset_{datetime.now().strftime("%Y%m%d")}.csv'
-            return response
+            # Stream rows to the client as they are written
+            return Response(
+                stream_with_context(_iter_csv_dicts(iter_feedback())),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename=feedback_dataset_{datetime.now().strftime("%Y%m%d")}.csv'}
+            )
 
-        return jsonify({
+        with _gc_paused():
+            dataset = list(iter_feedback())
+        return json_response({
             'success': True,
             'dataset_size': len(dataset),
             'data': dataset
@@ -1012,29 +1305,39 @@ def export_intent_dataset():
     Perfect for training intent classification models
     """
     try:
-        from database.models.conversation import Message
+        from database.models.conversation import Message, load_entities
 
-        # Get only user messages with intent classifications
-        messages = Message.query.filter(
+        intent_filters = (
             Message.message_type == 'user',
             Message.intent_classification.isnot(None)
-        ).all()
-
-        dataset = []
-        for msg in messages:
-            dataset.append({
-                'text': msg.content,
-                'intent': msg.intent_classification,
-                'confidence': msg.confidence_score,
-                'entities': msg.get_entities(),
-                'sentiment': msg.sentiment_score,
-                'timestamp': msg.timestamp.isoformat()
-            })
+        )
 
-        return jsonify({
+        # Distinct intent labels, computed by the database
+        intents = [row[0] for row in db.session.query(
+            Message.intent_classification
+        ).filter(*intent_filters).distinct().all()]
+
+        # Get only user messages with intent classifications, read in
+        # batches as plain column tuples rather than ORM instances
+        rows = db.session.query(
+            Message.content, Message.intent_classification, Message.confidence_score,
+            Message.entities_found, Message.sentiment_score, Message.timestamp
+        ).filter(*intent_filters).yield_per(1000)
+
+        with _gc_paused():
+            dataset = [{
+                'text': content,
+                'intent': intent,
+                'confidence': confidence,
+                'entities': load_entities(entities_found),
+                'sentiment': sentiment,
+                'timestamp': timestamp.isoformat()
+            } for content, intent, confidence, entities_found, sentiment, timestamp in rows]
+
+        return json_response({
             'success': True,
             'dataset_size': len(dataset),
-            'intents': list(set(msg.intent_classification for msg in messages if msg.intent_classification)),
+            'intents': intents,
             'data': dataset
         })
 
@@ -1043,37 +1346,32 @@ def export_intent_dataset():
 
 @auth_bp.route('/admin/knowledge-transfer', methods=['GET'])
 @admin_required
+@cached_json('knowledge_transfer', ttl=300)
 def get_knowledge_transfer():
     """Get knowledge transfer and user journey analytics"""
     try:
         from database.models.analytics import Feedback
         from collections import Counter
 
-        # Try to get from cache first (5 minute cache)
-        cache_key = "knowledge_transfer"
-        try:
-            from services.cache.simple_cache import cache
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info("Returning cached knowledge transfer data")
-                return jsonify(cached_data)
-        except:
-            pass
-
-        # Total interactions
-        total_conversations = Conversation.query.count()
-        total_users = User.query.filter_by(account_type='user').count()
-
-        # User journey stages
-        new_users = User.query.filter(User.created_at >= datetime.now(timezone.utc) - timedelta(days=30)).count()
+        # Total interactions and user journey stages in one round-trip
+        total_conversations, total_users, new_users = db.session.query(
+            db.session.query(db.func.count(Conversation.id)).scalar_subquery(),
+            db.session.query(db.func.count(User.id)).filter(User.account_type == 'user').scalar_subquery(),
+            db.session.query(db.func.count(User.id)).filter(
+                User.created_at >= datetime.now(timezone.utc) - timedelta(days=30)
+            ).scalar_subquery()
+        ).one()
         returning_users = total_users - new_users
 
-        # Knowledge categories (topics discussed) - optimized query
-        topic_query = db.session.query(
+        # Knowledge categories (top 10 topics discussed), ranked in SQL
+        conversation_count = db.func.count(Conversation.id)
+        topic_distribution = db.session.query(
             Conversation.current_topic,
-            db.func.count(Conversation.id).label('count')
-        ).filter(Conversation.current_topic.isnot(None)).group_by(Conversation.current_topic).all()
-        topic_distribution = [(t[0], t[1]) for t in topic_query][:10]
+            conversation_count.label('count')
+        ).filter(Conversation.current_topic.isnot(None))\
+            .group_by(Conversation.current_topic)\
+            .order_by(conversation_count.desc())\
+            .limit(10).all()
 
         # Regional knowledge spread - optimized query
         regional_query = db.session.query(
@@ -1083,14 +1381,16 @@ def get_knowledge_transfer():
         regional_adoption = [(r[0], r[1]) for r in regional_query]
 
         # Learning progression (users with multiple conversations = learning)
-        user_conversation_counts = db.session.query(
-            Conversation.user_id,
+        # Bucketed in SQL over per-user conversation counts
+        per_user = db.session.query(
             db.func.count(Conversation.id).label('conv_count')
-        ).group_by(Conversation.user_id).all()
-
-        beginners = sum(1 for _, count in user_conversation_counts if count == 1)
-        learners = sum(1 for _, count in user_conversation_counts if 2 <= count <= 5)
-        experts = sum(1 for _, count in user_conversation_counts if count > 5)
+        ).group_by(Conversation.user_id).subquery()
+        beginners, learners, experts = db.session.query(
+            db.func.sum(db.case((per_user.c.conv_count == 1, 1), else_=0)),
+            db.func.sum(db.case((per_user.c.conv_count.between(2, 5), 1), else_=0)),
+            db.func.sum(db.case((per_user.c.conv_count > 5, 1), else_=0))
+        ).one()
+        beginners, learners, experts = beginners or 0, learners or 0, experts or 0
 
         # Knowledge satisfaction (feedback on learning) - optimized query
         avg_knowledge_rating_query = db.session.query(
@@ -1098,24 +1398,32 @@ def get_knowledge_transfer():
         ).filter(Feedback.completeness_rating.isnot(None)).scalar()
         avg_knowledge_rating = float(avg_knowledge_rating_query) if avg_knowledge_rating_query else 0
 
-        # Most requested knowledge areas (crops) - optimized approach
-        # Query only mentioned_crops column instead of loading all conversations
-        import json
-        crop_counter = Counter()
-        conversations_with_crops = db.session.query(Conversation.mentioned_crops).filter(
-            Conversation.mentioned_crops.isnot(None)
-        ).limit(1000).all()  # Limit to prevent memory issues
-
-        for (crops_json,) in conversations_with_crops:
-            if crops_json:
-                try:
-                    crops = json.loads(crops_json) if isinstance(crops_json, str) else crops_json
-                    if isinstance(crops, list):
-                        crop_counter.update(crops)
-                except:
-                    pass
-
-        crop_demand = crop_counter.most_common(15)
+        # Most requested knowledge areas (crops), counted in the database
+        crop_demand = None
+        try:
+            crop_demand = AnalyticsRepository.get_crop_demand(limit=15)
+        except DatabaseError as e:
+            logger.warning("Crop demand aggregation fell back to Python: %s", e)
+
+        if crop_demand is None:
+            # Query only mentioned_crops column instead of loading all conversations
+            import json
+            crop_counter = Counter()
+            # Streamed in batches, so every conversation can be counted
+            conversations_with_crops = db.session.query(Conversation.mentioned_crops).filter(
+                Conversation.mentioned_crops.isnot(None)
+            ).yield_per(1000)
+
+            for (crops_json,) in conversations_with_crops:
+                if crops_json:
+                    try:
+                        crops = json.loads(crops_json) if isinstance(crops_json, str) else crops_json
+                        if isinstance(crops, list):
+                            crop_counter.update(crops)
+                    except:
+                        pass
+
+            crop_demand = crop_counter.most_common(15)
 
         response_data = {
             'success': True,
@@ -1136,68 +1444,40 @@ def get_knowledge_transfer():
             'crop_knowledge_demand': [{'crop': crop, 'requests': count} for crop, count in crop_demand]
         }
 
-        # Cache the result for 5 minutes
-        try:
-            from services.cache.simple_cache import cache
-            cache.set(cache_key, response_data, timeout=300)
-        except:
-            pass
-
-        return jsonify(response_data)
+        return json_response(response_data)
 
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Knowledge transfer endpoint:\n{traceback.format_exc()}")
-        return jsonify({'error': 'Failed to load knowledge transfer data', 'details': str(e)}), 500
+        logger.exception(f"Knowledge transfer endpoint error: {str(e)}")
+        return jsonify({'error': 'Failed to load knowledge transfer data'}), 500
 
 @auth_bp.route('/admin/analytics/detailed', methods=['GET'])
 @admin_required
+@cached_json('analytics_detailed', ttl=300)
 def get_detailed_analytics():
     """Get detailed analytics for Analytics tab"""
     logger.info("Analytics detailed endpoint called")
     try:
-        from database.models.conversation import Message
         from database.models.analytics import Feedback
         from sqlalchemy import func
         from collections import Counter
 
-        # Try to get from cache first (5 minute cache)
-        cache_key = "analytics_detailed"
-        try:
-            from services.cache.simple_cache import cache
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info("Returning cached detailed analytics")
-                return jsonify(cached_data)
-        except:
-            pass
-
         logger.info("Starting analytics queries")
 
-        # Intent distribution
-        intents = db.session.query(
-            Message.intent_classification,
-            func.count(Message.id).label('count')
-        ).filter(Message.intent_classification.isnot(None)).group_by(Message.intent_classification).all()
+        # Message breakdowns come from the hourly rollup table, which the
+        # background refresher rebuilds, or from live queries over messages
+        # when the dialect is unsupported or the rollup is not built yet
+        message_stats = None
+        try:
+            message_stats = AnalyticsRepository.get_message_stats()
+        except DatabaseError as e:
+            logger.warning(f"Message stats rollup unavailable: {str(e)}")
+        if message_stats is None:
+            message_stats = _live_message_stats()
 
-        intent_data = [{'intent': i[0], 'count': i[1]} for i in intents]
+        intent_data = [{'intent': intent, 'count': count} for intent, count in message_stats['intents']]
 
         # Hourly activity (messages per hour of day)
-        # Use database-agnostic approach
-        try:
-            # Try PostgreSQL EXTRACT function
-            hourly_activity = db.session.query(
-                func.extract('hour', Message.timestamp).label('hour'),
-                func.count(Message.id).label('count')
-            ).group_by('hour').all()
-        except:
-            # Fallback to SQLite strftime
-            hourly_activity = db.session.query(
-                func.strftime('%H', Message.timestamp).label('hour'),
-                func.count(Message.id).label('count')
-            ).group_by('hour').all()
-
-        hourly_data = {int(h[0]): h[1] for h in hourly_activity if h[0]}
+        hourly_data = message_stats['hourly']
         hourly_formatted = [hourly_data.get(h, 0) for h in range(24)]
 
         # Regional distribution (already optimized with GROUP BY - no memory issue)
@@ -1208,53 +1488,39 @@ def get_detailed_analytics():
 
         regional_data = [{'region': r[0], 'count': r[1]} for r in regional]
 
-        # Crop mentions over time (last 30 days)
-        crop_mentions = {}
-        # Query only mentioned_crops column to avoid loading mentioned_livestock which doesn't exist yet
-        import json
-        # OPTIMIZED: Limit to 1000 most recent conversations to prevent memory issues
-        conversations_with_crops = db.session.query(Conversation.mentioned_crops).filter(
-            Conversation.mentioned_crops.isnot(None)
-        ).order_by(Conversation.id.desc()).limit(1000).all()
-
-        for (mentioned_crops_json,) in conversations_with_crops:
-            if mentioned_crops_json:
-                try:
-                    crops = json.loads(mentioned_crops_json)
-                    for crop in crops:
-                        crop_mentions[crop] = crop_mentions.get(crop, 0) + 1
-                except:
-                    pass
-
-        crop_trends = [{'crop': k, 'mentions': v} for k, v in sorted(crop_mentions.items(), key=lambda x: x[1], reverse=True)[:10]]
+        # Crop mentions across the 1000 most recent conversations, unpacked
+        # and counted by the database where the dialect supports it
+        try:
+            top_crops = AnalyticsRepository.get_crop_demand(limit=10, recent_conversations=1000)
+        except DatabaseError as e:
+            logger.warning(f"Crop trends query failed: {str(e)}")
+            top_crops = None
+
+        if top_crops is None:
+            crop_mentions = {}
+            # Query only mentioned_crops column to avoid loading mentioned_livestock which doesn't exist yet
+            import json
+            conversations_with_crops = db.session.query(Conversation.mentioned_crops).filter(
+                Conversation.mentioned_crops.isnot(None)
+            ).order_by(Conversation.id.desc()).limit(1000).all()
+
+            for (mentioned_crops_json,) in conversations_with_crops:
+                if mentioned_crops_json:
+                    try:
+                        crops = json.loads(mentioned_crops_json)
+                        for crop in crops:
+                            crop_mentions[crop] = crop_mentions.get(crop, 0) + 1
+                    except:
+                        pass
+            top_crops = heapq.nlargest(10, crop_mentions.items(), key=lambda x: x[1])
+
+        crop_trends = [{'crop': k, 'mentions': v} for k, v in top_crops]
 
         # Response quality metrics
-        try:
-            # Try with ROUND function (works in PostgreSQL and SQLite)
-            confidence_distribution = db.session.query(
-                func.round(Message.confidence_score, 1).label('confidence'),
-                func.count(Message.id).label('count')
-            ).filter(Message.confidence_score.isnot(None)).group_by(func.round(Message.confidence_score, 1)).all()
-            confidence_data = [{'score': float(c[0]), 'count': c[1]} for c in confidence_distribution if c[0] is not None]
-        except Exception as e:
-            # Rollback transaction if query failed
-            db.session.rollback()
-            logger.warning(f"Confidence distribution query failed: {str(e)}")
-            confidence_data = []
+        confidence_data = [{'score': score, 'count': count} for score, count in message_stats['confidence']]
 
         # Sentiment distribution
-        try:
-            sentiment_stats = db.session.query(
-                func.avg(Message.sentiment_score).label('avg_sentiment'),
-                func.count(Message.id).filter(Message.sentiment_score > 0).label('positive'),
-                func.count(Message.id).filter(Message.sentiment_score < 0).label('negative'),
-                func.count(Message.id).filter(Message.sentiment_score == 0).label('neutral')
-            ).first()
-        except Exception as e:
-            # Rollback transaction if query failed
-            db.session.rollback()
-            logger.warning(f"Sentiment distribution query failed: {str(e)}")
-            sentiment_stats = (0, 0, 0, 0)
+        sentiment_stats = message_stats['sentiment']
 
         # Get country distribution for the country chart
         try:
@@ -1288,20 +1554,11 @@ def get_detailed_analytics():
             }
         }
 
-        # Cache the result for 5 minutes
-        try:
-            from services.cache.simple_cache import cache
-            cache.set(cache_key, response_data, timeout=300)
-        except:
-            pass
-
-        return jsonify(response_data)
+        return json_response(response_data)
 
     except Exception as e:
-        import traceback
-        logger.error(f"Error in analytics detailed: {str(e)}")
-        logger.error(f"Full traceback:\n{traceback.format_exc()}")
-        return jsonify({'error': 'Failed to fetch detailed analytics', 'details': str(e)}), 500
+        logger.exception(f"Error in analytics detailed: {str(e)}")
+        return jsonify({'error': 'Failed to fetch detailed analytics'}), 500
 
 @auth_bp.route('/admin/recent-activity', methods=['GET'])
 @admin_required
@@ -1311,47 +1568,56 @@ def get_recent_activity():
         from database.models.analytics import Feedback
         from datetime import datetime, timedelta
 
-        activities = []
+        # Fallback timestamp for rows missing one
+        now_iso = datetime.now().isoformat()
 
-        # Recent user registrations (last 10)
-        recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-        for user in recent_users:
-            activities.append({
-                'type': 'user_registration',
-                'title': 'New User Registered',
-                'description': f'{user.name} joined AgriBot',
-                'timestamp': user.created_at.isoformat() if user.created_at else datetime.now().isoformat()
-            })
-
-        # Recent conversations (last 5)
-        recent_convs = Conversation.query.order_by(Conversation.start_time.desc()).limit(5).all()
-        for conv in recent_convs:
-            user = User.query.get(conv.user_id)
-            activities.append({
-                'type': 'conversation',
-                'title': 'New Conversation',
-                'description': f'{user.name if user else "User"} started a conversation',
-                'timestamp': conv.start_time.isoformat() if conv.start_time else datetime.now().isoformat()
-            })
+        def latest(kind, timestamp, name, rating, *joins):
+            """Five most recent rows of one activity kind, as a union member"""
+            query = db.select(
+                db.literal(kind).label('kind'),
+                timestamp.label('ts'),
+                name.label('name'),
+                rating.label('rating')
+            )
+            for target, onclause in joins:
+                query = query.outerjoin(target, onclause)
+            return db.select(query.order_by(timestamp.desc()).limit(5).subquery())
+
+        no_name = db.cast(db.null(), db.String)
+        no_rating = db.cast(db.null(), db.Integer)
+
+        # Recent registrations, conversations (with their owner's name) and
+        # feedback, five of each, merged and ordered in one round-trip
+        recent = db.union_all(
+            latest('user_registration', User.created_at, User.name, no_rating),
+            latest('conversation', Conversation.start_time, User.name, no_rating,
+                   (User, User.id == Conversation.user_id)),
+            latest('feedback', Feedback.timestamp, no_name, Feedback.overall_rating)
+        ).subquery()
+        rows = db.session.execute(
+            db.select(recent).order_by(recent.c.ts.desc().nulls_first()).limit(15)
+        ).all()
 
-        # Recent feedback (last 5)
-        recent_feedback = Feedback.query.order_by(Feedback.timestamp.desc()).limit(5).all()
-        for fb in recent_feedback:
-            rating_text = f"{fb.overall_rating}/5 stars" if fb.overall_rating else "feedback"
+        activities = []
+        for kind, ts, name, rating in rows:
+            if kind == 'user_registration':
+                title, description = 'New User Registered', f'{name} joined AgriBot'
+            elif kind == 'conversation':
+                title, description = 'New Conversation', f'{name or "User"} started a conversation'
+            else:
+                rating_text = f"{rating}/5 stars" if rating else "feedback"
+                title, description = 'Feedback Received', f'User submitted {rating_text}'
             activities.append({
-                'type': 'feedback',
-                'title': 'Feedback Received',
-                'description': f'User submitted {rating_text}',
-                'timestamp': fb.timestamp.isoformat() if fb.timestamp else datetime.now().isoformat()
+                'type': kind,
+                'title': title,
+                'description': description,
+                'timestamp': ts.isoformat() if ts else now_iso
             })
 
-        # Sort all activities by timestamp
-        activities.sort(key=lambda x: x['timestamp'], reverse=True)
-
         # Return top 15 most recent
-        return jsonify({
+        return json_response({
             'success': True,
-            'activities': activities[:15]
+            'activities': activities
         })
 
     except Exception as e:
@@ -1367,12 +1633,12 @@ def temp_check_admin():
 
         if user:
             # Get account type safely
-            account_type = user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
+            account_type = enum_value(user.account_type)
 
             # Get status safely
             status = 'unknown'
             if hasattr(user, 'status'):
-                status = user.status.value if hasattr(user.status, 'value') else user.status
+                status = enum_value(user.status)
 
             return jsonify({
                 'exists': True,
@@ -1386,8 +1652,8 @@ def temp_check_admin():
         else:
             return jsonify({'exists': False, 'message': f'No user found with email: {email}'})
     except Exception as e:
-        import traceback
-        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+        logger.exception(f"Admin check failed: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/temp-test-login', methods=['POST'])
 def temp_test_login():
@@ -1419,7 +1685,7 @@ def temp_test_login():
         # Step 2: Check password
         debug_info['step'] = 'Checking password'
         debug_info['has_password_hash'] = bool(user.password_hash)
-        password_valid = check_password_hash(user.password_hash, password)
+        password_valid = verify_password(user.password_hash, password)
         debug_info['password_valid'] = password_valid
 
         if not password_valid:
@@ -1428,7 +1694,7 @@ def temp_test_login():
 
         # Step 3: Check account type
         debug_info['step'] = 'Checking account type'
-        user_account_type = user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
+        user_account_type = enum_value(user.account_type)
         debug_info['user_account_type'] = user_account_type
         debug_info['account_type_match'] = (user_account_type == account_type)
 
@@ -1439,7 +1705,7 @@ def temp_test_login():
         # Step 4: Check status
         debug_info['step'] = 'Checking status'
         if hasattr(user, 'status'):
-            user_status = user.status.value if hasattr(user.status, 'value') else user.status
+            user_status = enum_value(user.status)
             debug_info['user_status'] = user_status
             debug_info['status_active'] = (user_status == 'active')
 
@@ -1453,11 +1719,8 @@ def temp_test_login():
         return jsonify(debug_info), 200
 
     except Exception as e:
-        import traceback
-        return jsonify({
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 500
+        logger.exception(f"Login debug failed: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/temp-create-admin-now', methods=['GET'])
 def temp_create_admin_now():
@@ -1490,7 +1753,7 @@ def temp_create_admin_now():
             country='Cameroon',
             region='centre',
             account_type=AccountType.ADMIN,
-            password_hash=generate_password_hash(password),
+            password_hash=hash_password(password),
             created_at=datetime.now(timezone.utc)
         )
         db.session.add(admin)
@@ -1503,14 +1766,14 @@ def temp_create_admin_now():
                 'id': admin.id,
                 'name': admin.name,
                 'email': admin.email,
-                'account_type': admin.account_type.value if hasattr(admin.account_type, 'value') else admin.account_type
+                'account_type': enum_value(admin.account_type)
             }
         })
 
     except Exception as e:
         db.session.rollback()
-        import traceback
-        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+        logger.exception(f"Admin creation failed: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/temp-reset-password', methods=['POST'])
 def temp_reset_password():
@@ -1537,7 +1800,7 @@ def temp_reset_password():
 
         if user:
             # User exists - reset password
-            user.password_hash = generate_password_hash(new_password)
+            user.password_hash = hash_password(new_password)
             db.session.commit()
             action = 'reset'
         else:
@@ -1550,7 +1813,7 @@ def temp_reset_password():
                 country='Cameroon',
                 region='centre',
                 account_type=AccountType.ADMIN,
-                password_hash=generate_password_hash(new_password),
+                password_hash=hash_password(new_password),
                 created_at=datetime.now(timezone.utc)
             )
             db.session.add(user)
@@ -1566,7 +1829,7 @@ def temp_reset_password():
             'user': {
                 'name': user.name,
                 'email': user.email,
-                'account_type': user.account_type.value if hasattr(user.account_type, 'value') else user.account_type
+                'account_type': enum_value(user.account_type)
             }
         })
 
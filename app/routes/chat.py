@@ -5,8 +5,11 @@ Location: agribot/app/routes/chat.py
 Flask routes for chat functionality and real-time conversation handling.
 """
 
-from flask import Blueprint, request, jsonify, session, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, session, current_app, send_from_directory, url_for
+from werkzeug.exceptions import HTTPException
 from datetime import datetime
+from sqlalchemy import insert
+import json
 import uuid
 import logging
 import os
@@ -17,7 +20,10 @@ from database.models.conversation import Conversation, Message
 from database import db
 from utils.exceptions import AgriBotException
 from utils.validators import validate_chat_input
-from services.plant_id_service import PlantIdService
+from utils.responses import dumps, json_response, raw_json_response
+from services.cache.simple_cache import cache
+from services.background_jobs import image_analysis_jobs
+from services.plant_id_service import image_digest
 
 # Create blueprint
 chat_bp = Blueprint('chat', __name__)
@@ -25,6 +31,78 @@ chat_bp = Blueprint('chat', __name__)
 # Logger
 logger = logging.getLogger(__name__)
 
+# Summary and suggestions are polled by the UI; serve repeats from cache
+# until the conversation changes or this many seconds pass
+_CONTEXT_CACHE_TTL = 45
+
+_ALLOWED_IMAGE_EXTENSIONS = frozenset(('png', 'jpg', 'jpeg', 'gif', 'webp'))
+
+_TOPIC_SUGGESTIONS = {
+    'disease_identification': 'Help identify crop diseases',
+    'pest_control': 'Learn about pest management',
+    'fertilizer_advice': 'Get fertilizer recommendations',
+    'planting_guidance': 'Planting procedures and timing',
+    'harvest_timing': 'When and how to harvest',
+    'yield_optimization': 'Tips to increase crop yields',
+    'weather_inquiry': 'Weather advice for farming',
+    'market_information': 'Market prices and selling tips'
+}
+
+def _summary_key(user_id):
+    return f"chat:summary:{user_id}"
+
+def _suggestions_key(user_id):
+    return f"chat:suggestions:{user_id}"
+
+def _clear_context_cache(user_id):
+    """Drop a user's cached summary and suggestions"""
+    cache.delete(_summary_key(user_id))
+    cache.delete(_suggestions_key(user_id))
+
+def _store_plant_image(image_data, filename):
+    """Save upload bytes under a name derived from their content.
+
+    Re-uploads of the same photo share one file. Returns
+    (digest, stored filename, path).
+    """
+    upload_folder = os.path.join(os.getcwd(), 'uploads', 'plant_images')
+    os.makedirs(upload_folder, exist_ok=True)
+
+    digest = image_digest(image_data)
+    extension = os.path.splitext(filename or '')[1].lower()
+    if not extension[1:].isalnum():
+        extension = ''
+    unique_filename = f"{digest}{extension}"
+    file_path = os.path.join(upload_folder, unique_filename)
+
+    if not os.path.exists(file_path):
+        # Write then rename so a concurrent upload never sees a partial file
+        partial_path = f"{file_path}.{uuid.uuid4().hex}.part"
+        with open(partial_path, 'wb') as f:
+            f.write(image_data)
+        os.replace(partial_path, file_path)
+    return digest, unique_filename, file_path
+
+def _insert_message_pair(user_row, bot_row):
+    """Insert a user message and its bot reply in one statement; returns their ids.
+
+    Missing columns are filled with None so both rows share one INSERT, so
+    columns with defaults (has_image) must be given in both rows.
+    """
+    columns = user_row.keys() | bot_row.keys()
+    rows = [{column: row.get(column) for column in columns} for row in (user_row, bot_row)]
+    return db.session.scalars(
+        insert(Message).returning(Message.id, sort_by_parameter_order=True), rows
+    ).all()
+
+@chat_bp.after_request
+def clear_context_cache_after_change(response):
+    """Any successful write may change the conversation state"""
+    user_id = session.get('user_id')
+    if user_id and request.method in ('POST', 'DELETE') and response.status_code < 400:
+        _clear_context_cache(user_id)
+    return response
+
 @chat_bp.route('/message', methods=['POST'])
 def process_message():
     """Process user message and return bot response"""
@@ -86,6 +164,10 @@ def process_message():
             'error_type': 'agribot_error'
         }), 500
         
+    except HTTPException:
+        # Let the app's handlers answer (e.g. 413 for oversize bodies)
+        raise
+
     except Exception as e:
         logger.error(f"Unexpected error in chat: {str(e)}")
         return jsonify({
@@ -150,6 +232,9 @@ def submit_feedback():
             'feedback_id': feedback.id
         })
         
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"Error submitting feedback: {str(e)}")
         return jsonify({
@@ -165,16 +250,23 @@ def get_conversation_summary():
         if not user_id:
             return jsonify({'error': 'No active session'}), 400
         
+        cache_key = _summary_key(user_id)
+        body = cache.get(cache_key)
+        if body is not None:
+            return raw_json_response(body.encode('utf-8'))
+
         # Get AgriBot engine
         agribot_engine = current_app.agribot
         
         # Get conversation summary
         summary = agribot_engine.get_user_conversation_summary(user_id)
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'data': summary
         })
+        cache.set(cache_key, response.get_data(as_text=True), timeout=_CONTEXT_CACHE_TTL)
+        return response
         
     except Exception as e:
         logger.error(f"Error getting conversation summary: {str(e)}")
@@ -197,7 +289,8 @@ def end_conversation():
         # End conversation
         result = agribot_engine.end_user_conversation(user_id)
 
-        # Clear session
+        # Clear session (after_request no longer sees the user)
+        _clear_context_cache(user_id)
         session.pop('user_id', None)
 
         return jsonify({
@@ -267,6 +360,11 @@ def get_suggestions():
                 }
             })
         
+        cache_key = _suggestions_key(user_id)
+        body = cache.get(cache_key)
+        if body is not None:
+            return raw_json_response(body.encode('utf-8'))
+
         # Get AgriBot engine
         agribot_engine = current_app.agribot
         
@@ -275,27 +373,18 @@ def get_suggestions():
         suggested_topics = conversation_manager.suggest_next_topics(user_id)
         
         # Convert topics to user-friendly suggestions
-        topic_to_suggestion = {
-            'disease_identification': 'Help identify crop diseases',
-            'pest_control': 'Learn about pest management',
-            'fertilizer_advice': 'Get fertilizer recommendations',
-            'planting_guidance': 'Planting procedures and timing',
-            'harvest_timing': 'When and how to harvest',
-            'yield_optimization': 'Tips to increase crop yields',
-            'weather_inquiry': 'Weather advice for farming',
-            'market_information': 'Market prices and selling tips'
-        }
-        
-        suggestions = [topic_to_suggestion.get(topic, f"Learn about {topic}") 
+        suggestions = [_TOPIC_SUGGESTIONS.get(topic, f"Learn about {topic}") 
                       for topic in suggested_topics]
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'data': {
                 'suggestions': suggestions,
                 'context': 'contextual'
             }
         })
+        cache.set(cache_key, response.get_data(as_text=True), timeout=_CONTEXT_CACHE_TTL)
+        return response
         
     except Exception as e:
         logger.error(f"Error getting suggestions: {str(e)}")
@@ -315,33 +404,39 @@ def list_conversations():
         from database.models.conversation import Conversation, Message
         from database import db
 
+        # First user message of each conversation, cut to just past the
+        # preview length; correlated so it only runs for the rows returned
+        first_message = db.session.query(
+            db.func.substr(Message.content, 1, 51)
+        ).filter(
+            Message.conversation_id == Conversation.id,
+            Message.message_type == 'user'
+        ).order_by(Message.id).limit(1).correlate(Conversation).scalar_subquery()
+
         # Get all conversations for user, ordered by most recent
-        conversations = Conversation.query.filter_by(user_id=user_id)\
+        conversations = db.session.query(Conversation, first_message)\
+            .filter(Conversation.user_id == user_id)\
             .order_by(Conversation.start_time.desc())\
             .limit(50)\
             .all()
 
         # Format conversation data
         conversation_list = []
-        for conv in conversations:
+        for conv, first_content in conversations:
             # Get first user message as preview
-            first_message = Message.query.filter_by(
-                conversation_id=conv.id,
-                message_type='user'
-            ).first()
-
-            preview = first_message.content[:50] + '...' if first_message and len(first_message.content) > 50 else (first_message.content if first_message else 'No messages')
+            preview = first_content[:50] + '...' if first_content and len(first_content) > 50 else (first_content if first_content is not None else 'No messages')
 
             conversation_list.append({
                 'id': conv.id,
                 'title': conv.title,
                 'preview': preview,
-                'start_time': conv.start_time.isoformat(),
+                'start_time': conv.start_time,
                 'message_count': conv.message_count,
                 'current_topic': conv.current_topic
             })
 
-        return jsonify({
+        # json_response writes the datetimes as ISO 8601 itself
+        return json_response({
             'success': True,
             'data': {
                 'conversations': conversation_list,
@@ -364,11 +459,13 @@ def get_conversation(conversation_id):
         if not user_id:
             return jsonify({'error': 'No active session'}), 400
 
-        from database.models.conversation import Conversation, Message
-        from database import db
+        from database.models.conversation import Conversation
+        from sqlalchemy.orm import selectinload
 
-        # Get conversation and verify ownership
-        conversation = Conversation.query.filter_by(
+        # Get conversation (verifying ownership) with its messages, oldest first
+        conversation = Conversation.query.options(
+            selectinload(Conversation.messages)
+        ).filter_by(
             id=conversation_id,
             user_id=user_id
         ).first()
@@ -376,30 +473,25 @@ def get_conversation(conversation_id):
         if not conversation:
             return jsonify({'error': 'Conversation not found'}), 404
 
-        # Get all messages for this conversation
-        messages = Message.query.filter_by(conversation_id=conversation_id)\
-            .order_by(Message.timestamp.asc())\
-            .all()
-
         # Format messages
         message_list = []
-        for msg in messages:
+        for msg in conversation.messages:
             message_list.append({
                 'id': msg.id,
                 'content': msg.content,
                 'type': msg.message_type,
-                'timestamp': msg.timestamp.isoformat(),
+                'timestamp': msg.timestamp,
                 'intent': msg.intent_classification,
                 'confidence': msg.confidence_score
             })
 
-        return jsonify({
+        return json_response({
             'success': True,
             'data': {
                 'conversation': {
                     'id': conversation.id,
                     'title': conversation.title,
-                    'start_time': conversation.start_time.isoformat(),
+                    'start_time': conversation.start_time,
                     'current_topic': conversation.current_topic,
                     'message_count': conversation.message_count
                 },
@@ -458,9 +550,8 @@ def message_with_image():
     Requires both message text and image file
     """
     try:
-        import os
         from werkzeug.utils import secure_filename
-        from database.models.conversation import Conversation, Message
+        from database.models.conversation import Conversation
         from database.repositories.conversation_repository import ConversationRepository
 
         # Check if image was uploaded
@@ -485,9 +576,8 @@ def message_with_image():
             return jsonify({'error': 'Image size must be less than 10MB'}), 400
 
         # Validate file type
-        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
         file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        if file_ext not in allowed_extensions:
+        if file_ext not in _ALLOWED_IMAGE_EXTENSIONS:
             return jsonify({'error': 'Invalid file type. Allowed: png, jpg, jpeg, gif, webp'}), 400
 
         # Get user session
@@ -501,30 +591,20 @@ def message_with_image():
         user_region = request.form.get('user_region', 'centre')
         language = request.form.get('language', 'auto')
 
-        # Create uploads directory if it doesn't exist
-        upload_folder = os.path.join(os.getcwd(), 'uploads', 'plant_images')
-        os.makedirs(upload_folder, exist_ok=True)
-
-        # Generate unique filename
         filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(upload_folder, unique_filename)
 
-        # Save the file
+        # Read the upload once; the bytes are both saved and analyzed
         file.seek(0)
-        file.save(file_path)
+        image_data = file.read()
+        digest, unique_filename, file_path = _store_plant_image(image_data, filename)
         logger.info(f"Image saved to {file_path}")
 
-        # Read image data for analysis
-        with open(file_path, 'rb') as f:
-            image_data = f.read()
-
         # Initialize Plant.id service
-        plant_service = PlantIdService()
+        plant_service = current_app.plant_id_service
 
         # Analyze image
         logger.info(f"Analyzing plant image for user {user_id}")
-        health_data = plant_service.identify_health(image_data, language=language)
+        health_data = plant_service.identify_health(image_data, language=language, digest=digest)
 
         # Format response
         response_text = plant_service.format_response_text(health_data)
@@ -544,38 +624,37 @@ def message_with_image():
             )
             session['conversation_id'] = conversation.id
 
-        # Save user message with image
-        user_message = Message(
-            conversation_id=conversation.id,
-            content=message_text,
-            message_type='user',
-            has_image=True,
-            image_path=file_path,
-            image_filename=filename,
-            image_url=f'/uploads/plant_images/{unique_filename}',
-            intent_classification='disease_identification'
-        )
-
-        # Save image analysis results
-        user_message.set_image_analysis(health_data)
-
-        from database import db
-        db.session.add(user_message)
-        db.session.commit()
+        # Save user message with image and its analysis results
+        image_url = f'/uploads/plant_images/{unique_filename}'
+        user_row = {
+            'conversation_id': conversation.id,
+            'content': message_text,
+            'message_type': 'user',
+            'has_image': True,
+            'image_path': file_path,
+            'image_filename': filename,
+            'image_url': image_url,
+            'intent_classification': 'disease_identification',
+            'image_analysis': json.dumps(health_data)
+        }
 
         # Save bot response
-        bot_message = Message(
-            conversation_id=conversation.id,
-            content=response_text,
-            message_type='bot',
-            confidence_score=health_data.get('confidence', 0.0)
-        )
-        db.session.add(bot_message)
-        db.session.commit()
+        bot_row = {
+            'conversation_id': conversation.id,
+            'content': response_text,
+            'message_type': 'bot',
+            'has_image': False,
+            'confidence_score': health_data.get('confidence', 0.0)
+        }
 
-        # Update conversation
-        conversation.message_count += 2
-        db.session.commit()
+        # Write both messages and the conversation count in one transaction
+        try:
+            user_message_id, bot_message_id = _insert_message_pair(user_row, bot_row)
+            conversation.message_count += 2
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
 
         # Determine confidence
         confidence = health_data.get('confidence', 0.0)
@@ -587,10 +666,10 @@ def message_with_image():
             'data': {
                 'response': response_text,
                 'conversation_id': conversation.id,
-                'user_message_id': user_message.id,
-                'bot_message_id': bot_message.id,
+                'user_message_id': user_message_id,
+                'bot_message_id': bot_message_id,
                 'image_saved': True,
-                'image_url': user_message.image_url,
+                'image_url': image_url,
                 'metadata': {
                     'intent': 'disease_identification',
                     'confidence': confidence,
@@ -603,6 +682,9 @@ def message_with_image():
             'timestamp': datetime.now().isoformat()
         })
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"Error processing image message: {str(e)}")
         import traceback
@@ -612,6 +694,93 @@ def message_with_image():
             'error': 'Failed to process image message'
         }), 500
 
+def _analyze_plant_image(user_id, conversation_id, image_data, file_path, filename,
+                         unique_filename, language, user_message_text, digest=None):
+    """Run disease analysis on a saved image and record the exchange; returns the response payload"""
+    # Initialize Plant.id service
+    plant_service = current_app.plant_id_service
+
+    # Analyze image
+    logger.info(f"Analyzing plant image for user {user_id}")
+    health_data = plant_service.identify_health(image_data, language=language, digest=digest)
+
+    # Format response
+    response_text = plant_service.format_response_text(health_data)
+
+    # Determine confidence
+    confidence = health_data.get('confidence', 0.0)
+    if health_data.get('fallback'):
+        confidence = 0.5
+
+    # Save user message WITH image to database
+    # Use user's message text if provided, otherwise use default message
+    message_content = user_message_text if user_message_text else "[Image uploaded for disease identification]"
+
+    user_row = {
+        'conversation_id': conversation_id,
+        'content': message_content,
+        'message_type': 'user',
+        'has_image': True,
+        'image_path': file_path,
+        'image_filename': filename,
+        'image_url': f'/uploads/plant_images/{unique_filename}',
+        'intent_classification': 'disease_identification',
+        'confidence_score': confidence,
+        'image_analysis': json.dumps(health_data)
+    }
+
+    # Save bot response
+    bot_row = {
+        'conversation_id': conversation_id,
+        'content': response_text,
+        'message_type': 'bot',
+        'has_image': False,
+        'intent_classification': 'disease_identification',
+        'confidence_score': confidence
+    }
+
+    try:
+        _insert_message_pair(user_row, bot_row)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    logger.info(f"Image saved to database: {unique_filename}")
+
+    # IMPORTANT: Update Claude's conversation memory so it remembers this image analysis
+    try:
+        agribot_engine = current_app.agribot
+        if hasattr(agribot_engine, 'claude_service') and agribot_engine.claude_service:
+            # Update Claude's conversation context with the image analysis
+            agribot_engine.claude_service._update_conversation_context(
+                str(conversation_id),
+                message_content,  # User's message about the image
+                f"I analyzed the plant image. {response_text}"  # Bot's analysis response
+            )
+            logger.info(f"Updated Claude conversation context for conversation {conversation_id}")
+    except Exception as ctx_error:
+        logger.warning(f"Failed to update Claude conversation context: {str(ctx_error)}")
+
+    # The new messages change this user's summary and suggestions
+    _clear_context_cache(user_id)
+
+    return {
+        'success': True,
+        'data': {
+            'response': response_text,
+            'metadata': {
+                'intent': 'disease_identification',
+                'confidence': confidence,
+                'image_received': True,
+                'is_healthy': health_data.get('is_healthy'),
+                'diseases_count': len(health_data.get('diseases', [])),
+                'image_saved': True,
+                'image_url': f'/uploads/plant_images/{unique_filename}'
+            }
+        },
+        'timestamp': datetime.now().isoformat()
+    }
+
 @chat_bp.route('/analyze-image', methods=['POST'])
 def analyze_image():
     """
@@ -666,92 +835,29 @@ def analyze_image():
         filename = file.filename
 
         # Save image to filesystem
-        upload_folder = os.path.join(os.getcwd(), 'uploads', 'plant_images')
-        os.makedirs(upload_folder, exist_ok=True)
-
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(upload_folder, unique_filename)
-
-        # Write image to disk
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
-
-        # Initialize Plant.id service
-        plant_service = PlantIdService()
-
-        # Analyze image
-        logger.info(f"Analyzing plant image for user {user_id}")
-        health_data = plant_service.identify_health(image_data, language=language)
-
-        # Format response
-        response_text = plant_service.format_response_text(health_data)
-
-        # Determine confidence
-        confidence = health_data.get('confidence', 0.0)
-        if health_data.get('fallback'):
-            confidence = 0.5
-
-        # Save user message WITH image to database
-        # Use user's message text if provided, otherwise use default message
-        message_content = user_message_text if user_message_text else "[Image uploaded for disease identification]"
-
-        user_message = Message(
-            conversation_id=conversation.id,
-            content=message_content,
-            message_type='user',
-            has_image=True,
-            image_path=file_path,
-            image_filename=filename,
-            image_url=f'/uploads/plant_images/{unique_filename}',
-            intent_classification='disease_identification',
-            confidence_score=confidence
-        )
-        user_message.set_image_analysis(health_data)
-        db.session.add(user_message)
-
-        # Save bot response
-        bot_message = Message(
-            conversation_id=conversation.id,
-            content=response_text,
-            message_type='bot',
-            intent_classification='disease_identification',
-            confidence_score=confidence
-        )
-        db.session.add(bot_message)
-
-        db.session.commit()
-        logger.info(f"Image saved to database: {unique_filename}")
+        digest, unique_filename, file_path = _store_plant_image(image_data, filename)
+
+        if request.form.get('async') == '1':
+            # Answer at once; the client polls analyze_image_status
+            job_id = image_analysis_jobs.submit(
+                _analyze_plant_image, user_id, conversation.id, image_data, file_path,
+                filename, unique_filename, language, user_message_text, digest,
+                user_id=user_id
+            )
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'conversation_id': conversation.id,
+                'status_url': url_for('chat.analyze_image_status', job_id=job_id)
+            }), 202
 
-        # IMPORTANT: Update Claude's conversation memory so it remembers this image analysis
-        try:
-            agribot_engine = current_app.agribot
-            if hasattr(agribot_engine, 'claude_service') and agribot_engine.claude_service:
-                # Update Claude's conversation context with the image analysis
-                agribot_engine.claude_service._update_conversation_context(
-                    str(conversation.id),
-                    message_content,  # User's message about the image
-                    f"I analyzed the plant image. {response_text}"  # Bot's analysis response
-                )
-                logger.info(f"Updated Claude conversation context for conversation {conversation.id}")
-        except Exception as ctx_error:
-            logger.warning(f"Failed to update Claude conversation context: {str(ctx_error)}")
+        return jsonify(_analyze_plant_image(
+            user_id, conversation.id, image_data, file_path,
+            filename, unique_filename, language, user_message_text, digest
+        ))
 
-        return jsonify({
-            'success': True,
-            'data': {
-                'response': response_text,
-                'metadata': {
-                    'intent': 'disease_identification',
-                    'confidence': confidence,
-                    'image_received': True,
-                    'is_healthy': health_data.get('is_healthy'),
-                    'diseases_count': len(health_data.get('diseases', [])),
-                    'image_saved': True,
-                    'image_url': f'/uploads/plant_images/{unique_filename}'
-                }
-            },
-            'timestamp': datetime.now().isoformat()
-        })
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error(f"Error analyzing image: {str(e)}")
@@ -760,6 +866,23 @@ def analyze_image():
             'error': 'Failed to analyze image'
         }), 500
 
+@chat_bp.route('/analyze-image/status/<job_id>', methods=['GET'])
+def analyze_image_status(job_id):
+    """Get the state, and once done the result, of a queued image analysis"""
+    job = image_analysis_jobs.get(job_id, user_id=session.get('user_id'))
+    if not job:
+        return jsonify({'success': False, 'error': 'Analysis job not found'}), 404
+
+    if job['status'] == 'done':
+        return jsonify(job['result'])
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'status': 'failed', 'error': 'Failed to analyze image'}), 500
+    return jsonify({'success': True, 'status': job['status'], 'job_id': job_id}), 202
+
+def _sse_event(payload) -> bytes:
+    """Encode one server-sent event carrying a JSON payload"""
+    return b"data: " + dumps(payload) + b"\n\n"
+
 @chat_bp.route('/message/stream', methods=['POST'])
 def process_message_stream():
     """Process user message with streaming response (can be cancelled)"""
@@ -799,23 +922,30 @@ def process_message_stream():
 
                 # Stream chunks to client
                 for chunk in response_stream:
-                    yield f"data: {chunk}\n\n"
+                    yield _sse_event({'chunk': chunk})
 
-                yield "data: [DONE]\n\n"
+                # The response finished after after_request ran
+                _clear_context_cache(user_id)
+                yield b"data: [DONE]\n\n"
 
             except Exception as e:
                 logger.error(f"Streaming error: {str(e)}")
-                yield f"data: {{\"error\": \"{str(e)}\"}}\n\n"
+                yield _sse_event({'error': str(e)})
 
+        # Frames are already bytes, so skip the per-chunk str encoding
         return Response(
             stream_with_context(generate()),
             mimetype='text/event-stream',
             headers={
                 'Cache-Control': 'no-cache',
                 'X-Accel-Buffering': 'no'
-            }
+            },
+            direct_passthrough=True
         )
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"Streaming setup error: {str(e)}")
         return jsonify({'error': str(e)}), 500
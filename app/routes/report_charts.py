@@ -25,19 +25,16 @@ def create_user_growth_chart(users, conversations):
         user_counts = []
         conv_counts = []
 
-        for i in range(6, -1, -1):
-            date = datetime.now() - timedelta(days=i)
-            dates.append(date.strftime('%m/%d'))
-
-            # Count users created on this day
-            day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = day_start + timedelta(days=1)
+        # Bucket users and conversations by day in one pass each
+        today = datetime.now().date()
+        users_by_day = Counter(u.created_at.date() for u in users if u.created_at)
+        convs_by_day = Counter(c.start_time.date() for c in conversations if c.start_time)
 
-            user_count = sum(1 for u in users if u.created_at and day_start <= u.created_at < day_end)
-            conv_count = sum(1 for c in conversations if c.start_time and day_start <= c.start_time < day_end)
-
-            user_counts.append(user_count)
-            conv_counts.append(conv_count)
+        for i in range(6, -1, -1):
+            day = today - timedelta(days=i)
+            dates.append(day.strftime('%m/%d'))
+            user_counts.append(users_by_day[day])
+            conv_counts.append(convs_by_day[day])
 
         # Plot
         x = range(len(dates))
@@ -198,11 +195,7 @@ def create_regional_distribution_chart(users):
 
     try:
         # Count users by region
-        region_counts = Counter()
-        for user in users:
-            if user.region:
-                region_name = user.region.value if hasattr(user.region, 'value') else user.region
-                region_counts[region_name] += 1
+        region_counts = Counter(user.region for user in users if user.region)
 
         if not region_counts:
             # Create "No data" chart
@@ -215,7 +208,7 @@ def create_regional_distribution_chart(users):
             return chart_path
 
         # Sort by count
-        sorted_regions = sorted(region_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        sorted_regions = region_counts.most_common(10)
         regions = [r[0] for r in sorted_regions]
         counts = [r[1] for r in sorted_regions]
 
@@ -53,6 +53,8 @@ class AppConfig:
         self.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-key-change-in-production')
         self.debug = os.getenv('FLASK_ENV') == 'development'
         self.testing = False
+        # Exposes the /temp-* account debugging endpoints
+        self.enable_debug_auth = os.getenv('ENABLE_DEBUG_AUTH', 'false').lower() == 'true'
 
         # Component configurations
         self.database = DatabaseConfig()
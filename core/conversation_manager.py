@@ -14,6 +14,10 @@ from database.repositories.user_repository import UserRepository
 from nlp import NLPProcessor
 from utils.exceptions import AgriBotException
 
+# Topics suggested first once a user has mentioned crops
+_CROP_RELEVANT_TOPICS = ('disease_identification', 'pest_control',
+                         'fertilizer_advice', 'harvest_timing', 'yield_optimization')
+
 @dataclass
 class ConversationState:
     """Current state of conversation"""
@@ -314,14 +318,14 @@ class ConversationManager:
             return ['planting_guidance', 'disease_identification', 'fertilizer_advice']
         
         current_topic = state.current_topic
-        suggested_topics = self.topic_transitions.get(current_topic, [])
+        # Copy: extending the shared transition list would leak crop topics
+        # into later suggestions for every user
+        suggested_topics = self.topic_transitions.get(current_topic, [])[:3]
         
         # Filter based on mentioned entities
-        if state.mentioned_crops:
+        if state.mentioned_crops and len(suggested_topics) < 3:
             # If crops mentioned, prioritize crop-specific topics
-            crop_relevant_topics = ['disease_identification', 'pest_control', 
-                                  'fertilizer_advice', 'harvest_timing', 'yield_optimization']
-            suggested_topics.extend([t for t in crop_relevant_topics if t not in suggested_topics])
+            suggested_topics.extend([t for t in _CROP_RELEVANT_TOPICS if t not in suggested_topics])
         
         return suggested_topics[:3]  # Return top 3 suggestions
     
@@ -21,6 +21,7 @@ def init_db(app):
     from database.models.conversation import Conversation, Message
     from database.models.analytics import Feedback, UsageAnalytics, ErrorLog
     from database.models.geographic import GeographicData, ClimateData
+    from database.models.jobs import BackgroundJob
 
     # Initialize SQLAlchemy
     db.init_app(app)
@@ -0,0 +1,35 @@
+# database/migrations/002_analytics_indexes.py
+"""
+Composite indexes for the admin analytics and export queries
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create composite and partial indexes"""
+    op.create_index(
+        'ix_conversations_start_time_crops', 'conversations', ['start_time'],
+        postgresql_where=sa.text('mentioned_crops IS NOT NULL'),
+        sqlite_where=sa.text('mentioned_crops IS NOT NULL')
+    )
+    op.create_index('ix_users_region_created_at', 'users', ['region', 'created_at'])
+    op.create_index('ix_messages_timestamp_confidence', 'messages', ['timestamp', 'confidence_score'])
+    op.create_index(
+        'ix_messages_conversation_type_timestamp', 'messages',
+        ['conversation_id', 'message_type', 'timestamp']
+    )
+
+
+def downgrade():
+    """Drop the composite and partial indexes"""
+    op.drop_index('ix_messages_conversation_type_timestamp', table_name='messages')
+    op.drop_index('ix_messages_timestamp_confidence', table_name='messages')
+    op.drop_index('ix_users_region_created_at', table_name='users')
+    op.drop_index('ix_conversations_start_time_crops', table_name='conversations')
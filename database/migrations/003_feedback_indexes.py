@@ -0,0 +1,22 @@
+# database/migrations/003_feedback_indexes.py
+"""
+Indexes for looking up feedback by conversation and by user over time
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the feedback lookup index"""
+    # ix_feedback_conversation_id already exists from 001
+    op.create_index('ix_feedback_user_id_timestamp', 'feedback', ['user_id', 'timestamp'])
+
+
+def downgrade():
+    """Drop the feedback lookup index"""
+    op.drop_index('ix_feedback_user_id_timestamp', table_name='feedback')
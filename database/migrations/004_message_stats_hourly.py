@@ -0,0 +1,37 @@
+# database/migrations/004_message_stats_hourly.py
+"""
+Hourly message rollup table for the detailed analytics dashboard
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the message_stats_hourly rollup table"""
+    op.create_table(
+        'message_stats_hourly',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hour_bucket', sa.DateTime(), nullable=False),
+        sa.Column('intent_classification', sa.String(50), nullable=True),
+        sa.Column('confidence_bucket', sa.Float(), nullable=True),
+        sa.Column('message_count', sa.Integer(), nullable=False, default=0),
+        sa.Column('sentiment_count', sa.Integer(), nullable=False, default=0),
+        sa.Column('sentiment_sum', sa.Float(), nullable=True),
+        sa.Column('positive_count', sa.Integer(), nullable=False, default=0),
+        sa.Column('negative_count', sa.Integer(), nullable=False, default=0),
+        sa.Column('neutral_count', sa.Integer(), nullable=False, default=0),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_message_stats_hourly_hour_bucket', 'message_stats_hourly', ['hour_bucket'])
+
+
+def downgrade():
+    """Drop the message_stats_hourly rollup table"""
+    op.drop_index('ix_message_stats_hourly_hour_bucket', table_name='message_stats_hourly')
+    op.drop_table('message_stats_hourly')
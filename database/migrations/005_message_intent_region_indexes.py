@@ -0,0 +1,32 @@
+# database/migrations/005_message_intent_region_indexes.py
+"""
+Partial indexes for classified user messages and conversations with a region
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the intent and region partial indexes"""
+    op.create_index(
+        'ix_messages_type_intent', 'messages', ['message_type', 'intent_classification'],
+        postgresql_where=sa.text('intent_classification IS NOT NULL'),
+        sqlite_where=sa.text('intent_classification IS NOT NULL')
+    )
+    op.create_index(
+        'ix_conversations_region', 'conversations', ['region'],
+        postgresql_where=sa.text('region IS NOT NULL'),
+        sqlite_where=sa.text('region IS NOT NULL')
+    )
+
+
+def downgrade():
+    """Drop the intent and region partial indexes"""
+    op.drop_index('ix_conversations_region', table_name='conversations')
+    op.drop_index('ix_messages_type_intent', table_name='messages')
@@ -0,0 +1,23 @@
+# database/migrations/006_message_preview_index.py
+"""
+Index for looking up the first user message of each conversation
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the conversation preview index"""
+    op.create_index(
+        'ix_messages_conversation_type_id', 'messages', ['conversation_id', 'message_type', 'id']
+    )
+
+
+def downgrade():
+    """Drop the conversation preview index"""
+    op.drop_index('ix_messages_conversation_type_id', table_name='messages')
@@ -0,0 +1,35 @@
+# database/migrations/007_background_jobs.py
+"""
+Background job state shared by all worker processes
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the background_jobs table"""
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.String(32), nullable=False),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('user_id', sa.String(64), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_background_jobs_created_at', 'background_jobs', ['created_at'])
+
+
+def downgrade():
+    """Drop the background_jobs table"""
+    op.drop_index('ix_background_jobs_created_at', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -75,10 +75,14 @@ class Analytics(db.Model):
 class Feedback(db.Model):
     """User feedback model for collecting user satisfaction data"""
     __tablename__ = 'feedback'
+    __table_args__ = (
+        # Dataset exports match feedback to a user's messages by time
+        db.Index('ix_feedback_user_id_timestamp', 'user_id', 'timestamp'),
+    )
     
     # Primary key and relationships
     id = db.Column(db.Integer, primary_key=True)
-    conversation_id = db.Column(db.Integer, db.ForeignKey('conversations.id'), nullable=False)
+    conversation_id = db.Column(db.Integer, db.ForeignKey('conversations.id'), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     # Feedback ratings (1-5 scale)
@@ -142,6 +146,28 @@ class UsageAnalytics(db.Model):
         return f'<UsageAnalytics {self.date} - {self.total_conversations} conversations>'
 
 
+class MessageStatsHourly(db.Model):
+    """Hourly message rollup backing the detailed analytics dashboard"""
+    __tablename__ = 'message_stats_hourly'
+    
+    # Primary key and grouping columns
+    id = db.Column(db.Integer, primary_key=True)
+    hour_bucket = db.Column(db.DateTime, nullable=False, index=True)
+    intent_classification = db.Column(db.String(50))
+    confidence_bucket = db.Column(db.Float)  # Confidence rounded to 0.1
+    
+    # Aggregated metrics
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    sentiment_count = db.Column(db.Integer, nullable=False, default=0)
+    sentiment_sum = db.Column(db.Float)
+    positive_count = db.Column(db.Integer, nullable=False, default=0)
+    negative_count = db.Column(db.Integer, nullable=False, default=0)
+    neutral_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<MessageStatsHourly {self.hour_bucket} {self.intent_classification} - {self.message_count} messages>'
+
+
 class ErrorLog(db.Model):
     """Error logging for system monitoring"""
     __tablename__ = 'error_logs'
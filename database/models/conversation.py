@@ -12,9 +12,29 @@ import json
 from typing import List, Dict, Optional
 
 
+def load_entities(entities_found: Optional[str]) -> Dict:
+    """Decode a stored entities_found value, treating bad JSON as empty"""
+    if entities_found:
+        try:
+            return json.loads(entities_found)
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
 class Conversation(db.Model):
     """Conversation session model for tracking user interactions"""
     __tablename__ = 'conversations'
+    __table_args__ = (
+        # Crop inquiry counts scan recent conversations that mention crops
+        db.Index('ix_conversations_start_time_crops', 'start_time',
+                 postgresql_where=db.text('mentioned_crops IS NOT NULL'),
+                 sqlite_where=db.text('mentioned_crops IS NOT NULL')),
+        # Regional analytics group conversations that have a region
+        db.Index('ix_conversations_region', 'region',
+                 postgresql_where=db.text('region IS NOT NULL'),
+                 sqlite_where=db.text('region IS NOT NULL')),
+    )
     
     # Primary key and user relationship
     id = db.Column(db.Integer, primary_key=True)
@@ -40,7 +60,8 @@ class Conversation(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     
     # Relationships
-    messages = db.relationship('Message', backref='conversation', lazy=True, cascade='all, delete-orphan')
+    messages = db.relationship('Message', backref='conversation', lazy=True, cascade='all, delete-orphan',
+                               order_by='Message.timestamp')
     feedback_entries = db.relationship('Feedback', backref='conversation', lazy=True)
     
     def __repr__(self):
@@ -104,9 +125,32 @@ class Conversation(db.Model):
         """Count conversations for a specific user"""
         return cls.query.filter_by(user_id=user_id).count()
 
+    @classmethod
+    def count_by_users(cls, user_ids: List[int]) -> Dict[int, int]:
+        """Count conversations for several users in one grouped query"""
+        if not user_ids:
+            return {}
+        rows = db.session.query(cls.user_id, db.func.count(cls.id))\
+            .filter(cls.user_id.in_(user_ids))\
+            .group_by(cls.user_id)\
+            .all()
+        return dict(rows)
+
 class Message(db.Model):
     """Individual message model for storing conversation messages"""
     __tablename__ = 'messages'
+    __table_args__ = (
+        # Dataset exports filter and order by time, optionally by confidence
+        db.Index('ix_messages_timestamp_confidence', 'timestamp', 'confidence_score'),
+        # Bot replies are looked up per conversation in time order
+        db.Index('ix_messages_conversation_type_timestamp', 'conversation_id', 'message_type', 'timestamp'),
+        # Conversation previews take the first user message by id
+        db.Index('ix_messages_conversation_type_id', 'conversation_id', 'message_type', 'id'),
+        # Intent dataset export and intent analytics read classified user messages
+        db.Index('ix_messages_type_intent', 'message_type', 'intent_classification',
+                 postgresql_where=db.text('intent_classification IS NOT NULL'),
+                 sqlite_where=db.text('intent_classification IS NOT NULL')),
+    )
 
     # Primary key and conversation relationship
     id = db.Column(db.Integer, primary_key=True)
@@ -137,12 +181,7 @@ class Message(db.Model):
     
     def get_entities(self) -> Dict:
         """Get entities found in this message"""
-        if self.entities_found:
-            try:
-                return json.loads(self.entities_found)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+        return load_entities(self.entities_found)
     
     def set_entities(self, entities: Dict):
         """Set the entities found in this message"""
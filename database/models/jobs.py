@@ -0,0 +1,39 @@
+"""
+Background Job Model
+Location: agribot/database/models/jobs.py
+
+Defines the table recording the state of background jobs, so any
+worker process can answer status polls for a job another one runs.
+"""
+
+from database import db
+from datetime import datetime, timezone
+import json
+from typing import Any, Dict
+
+
+class BackgroundJob(db.Model):
+    """State and result of a job run off the request thread"""
+    __tablename__ = 'background_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)
+    # Session user ids are ints for accounts and uuid strings for guests
+    user_id = db.Column(db.String(64), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.kind} {self.id} - {self.status}>'
+
+    def get_result(self) -> Dict[str, Any]:
+        """Get the stored job result"""
+        return json.loads(self.result) if self.result else {}
+
+    def set_result(self, result: Dict[str, Any]):
+        """Store the job result"""
+        self.result = json.dumps(result, default=str)
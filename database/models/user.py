@@ -7,9 +7,10 @@ and tracking user activity within the AgriBot system.
 """
 
 from database import db
+from sqlalchemy.orm import load_only
 from datetime import datetime, timezone
 from typing import Dict
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import hash_password, verify_password
 import enum
 
 
@@ -34,9 +35,17 @@ class UserStatus(enum.Enum):
     INACTIVE = 'inactive'
     DELETED = 'deleted'
 
+def enum_value(value):
+    """Plain value of an enum column, passing strings through unchanged"""
+    return value.value if isinstance(value, enum.Enum) else value
+
 class User(db.Model):
     """User model for storing farmer/user information and preferences"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Activity trends count sign-ups per day within a region
+        db.Index('ix_users_region_created_at', 'region', 'created_at'),
+    )
     
     # Primary identification
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -59,7 +68,7 @@ class User(db.Model):
     profile_data = db.Column(db.JSON)  # Additional profile data
     
     # Tracking fields
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
     last_active = db.Column(db.DateTime, nullable=True)
     last_login = db.Column(db.DateTime, nullable=True)
     total_conversations = db.Column(db.Integer, default=0)
@@ -74,11 +83,11 @@ class User(db.Model):
     # Authentication methods
     def set_password(self, password: str):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password: str) -> bool:
         """Check if provided password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
     
     def update_last_active(self):
         """Update the last active timestamp"""
@@ -138,10 +147,18 @@ class User(db.Model):
         """Get user by email"""
         return cls.query.filter_by(email=email).first()
     
+    @classmethod
+    def _listing_query(cls):
+        """Query loading only the columns shown in admin listings and exports"""
+        return cls.query.options(load_only(
+            cls.id, cls.name, cls.email, cls.phone, cls.region,
+            cls.account_type, cls.status, cls.created_at, cls.last_login
+        ))
+    
     @classmethod
     def get_all_paginated(cls, page=1, per_page=50, region=None, status=None, search=None):
         """Get paginated users with filters"""
-        query = cls.query
+        query = cls._listing_query()
         
         # Apply filters
         if region:
@@ -237,10 +254,8 @@ class User(db.Model):
         return [{'region': r.region.value, 'count': r.count} for r in result]
     
     @classmethod
-    def get_for_export(cls, region=None, status=None, start_date=None, end_date=None):
-        """Get users for export"""
-        query = cls.query
-        
+    def _filter_for_export(cls, query, region=None, status=None, start_date=None, end_date=None):
+        """Apply the export filters to an ORM query or Core select"""
         if region:
             query = query.filter(cls.region == CameroonRegion(region))
         if status:
@@ -249,8 +264,35 @@ class User(db.Model):
             query = query.filter(cls.created_at >= start_date)
         if end_date:
             query = query.filter(cls.created_at <= end_date)
-        
-        return query.all()
+        return query
+    
+    @classmethod
+    def get_for_export(cls, region=None, status=None, start_date=None, end_date=None):
+        """Get users for export"""
+        return cls._filter_for_export(cls._listing_query(), region, status, start_date, end_date).all()
+    
+    @classmethod
+    def iter_export_rows(cls, region=None, status=None, start_date=None, end_date=None, batch_size=5000):
+        """Stream export rows with conversation counts as plain tuples.
+
+        Uses a Core select joined to grouped conversation counts, fetched in
+        batches, so no ORM objects are built per user.
+        """
+        from database.models.conversation import Conversation
+
+        conv_counts = db.select(
+            Conversation.user_id,
+            db.func.count(Conversation.id).label('conversation_count')
+        ).group_by(Conversation.user_id).subquery()
+
+        stmt = db.select(
+            cls.id, cls.name, cls.email, cls.phone, cls.region, cls.account_type, cls.status,
+            db.func.coalesce(conv_counts.c.conversation_count, 0),
+            cls.created_at, cls.last_login
+        ).outerjoin(conv_counts, conv_counts.c.user_id == cls.id).order_by(cls.id)
+        stmt = cls._filter_for_export(stmt, region, status, start_date, end_date)
+
+        return db.session.execute(stmt.execution_options(yield_per=batch_size))
 
     # Backward compatibility property
     @property
@@ -7,6 +7,7 @@ Handles feedback collection, usage analytics, and error logging.
 """
 
 from typing import Optional, List, Dict, Any
+import heapq
 from datetime import datetime, timedelta, date
 from database.models.analytics import Feedback, UsageAnalytics, ErrorLog, db
 from database.models.conversation import Conversation, Message
@@ -265,6 +266,258 @@ class AnalyticsRepository:
                 pass
             return []
     
+    @staticmethod
+    def get_public_summary(days: int = 30) -> Dict[str, Any]:
+        """Get the public headline metrics for the last N days in a single query"""
+        try:
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+            conversation_count = db.session.query(db.func.count(Conversation.id))\
+                .join(User)\
+                .filter(Conversation.start_time >= cutoff_date)\
+                .scalar_subquery()
+
+            message_count = db.session.query(db.func.count(Message.id))\
+                .join(Conversation).join(User)\
+                .filter(Conversation.start_time >= cutoff_date)\
+                .scalar_subquery()
+
+            total_conversations, total_messages, total_feedback, helpful_count, avg_overall = db.session.query(
+                conversation_count,
+                message_count,
+                db.func.count(Feedback.id),
+                db.func.sum(db.case((Feedback.helpful == True, 1), else_=0)),
+                db.func.avg(Feedback.overall_rating)
+            ).filter(Feedback.timestamp >= cutoff_date).one()
+
+            satisfaction_rate = (helpful_count / total_feedback * 100) if total_feedback else 0
+
+            return {
+                'total_conversations': total_conversations or 0,
+                'total_messages': total_messages or 0,
+                'average_rating': round(float(avg_overall or 0), 2),
+                'satisfaction_rate': round(satisfaction_rate, 2),
+                'period_days': days
+            }
+        except Exception as e:
+            raise DatabaseError(f"Failed to get public summary: {str(e)}")
+    
+    @staticmethod
+    def _crop_elements_from() -> Optional[str]:
+        """FROM clause unpacking c.mentioned_crops into crop.value rows for this dialect"""
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            return 'CROSS JOIN LATERAL json_array_elements_text(CAST(c.mentioned_crops AS json)) AS crop(value)'
+        if dialect == 'sqlite':
+            return ', json_each(c.mentioned_crops) AS crop'
+        return None
+    
+    @staticmethod
+    def get_crop_demand(limit: int = 15, recent_conversations: int = None) -> Optional[List[tuple]]:
+        """Most mentioned crops, counted in the database.
+
+        Counts across all conversations, or only the most recent
+        recent_conversations that mention crops. Returns (crop, count) pairs,
+        or None when the dialect has no supported JSON function.
+        """
+        crops_from = AnalyticsRepository._crop_elements_from()
+        if crops_from is None:
+            return None
+
+        params = {'limit': limit}
+        conversations = 'conversations'
+        if recent_conversations is not None:
+            params['recent_conversations'] = recent_conversations
+            conversations = """(
+                SELECT mentioned_crops FROM conversations
+                WHERE mentioned_crops IS NOT NULL
+                ORDER BY id DESC
+                LIMIT :recent_conversations
+            )"""
+
+        query = db.text(f"""
+            SELECT crop.value AS crop_name, COUNT(*) AS requests
+            FROM {conversations} c
+            {crops_from}
+            WHERE c.mentioned_crops IS NOT NULL
+            GROUP BY crop.value
+            ORDER BY requests DESC
+            LIMIT :limit
+        """)
+
+        try:
+            return [tuple(row) for row in db.session.execute(query, params)]
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseError(f"Failed to count crop demand: {str(e)}")
+    
+    @staticmethod
+    def get_crop_mention_counts(cutoff_date: datetime, previous_cutoff: datetime,
+                                region: str = 'all') -> Optional[tuple]:
+        """Count crop mentions in the current and previous periods inside the database.
+
+        mentioned_crops holds a JSON array in a text column, so it is unpacked
+        with the dialect's JSON table function. Returns (current, previous)
+        dicts keyed by lowercased crop, or None when the dialect has no
+        supported JSON function.
+        """
+        crops_from = AnalyticsRepository._crop_elements_from()
+        if crops_from is None:
+            return None
+
+        query = db.text(f"""
+            SELECT lower(trim(crop.value)) AS crop_name,
+                   SUM(CASE WHEN c.start_time >= :cutoff_date THEN 1 ELSE 0 END) AS current_count,
+                   SUM(CASE WHEN c.start_time < :cutoff_date THEN 1 ELSE 0 END) AS previous_count
+            FROM conversations c
+            JOIN users u ON u.id = c.user_id
+            {crops_from}
+            WHERE c.start_time >= :previous_cutoff
+              AND c.mentioned_crops IS NOT NULL
+              AND (:region = 'all' OR u.region = :region)
+              AND trim(crop.value) <> ''
+            GROUP BY lower(trim(crop.value))
+        """)
+
+        try:
+            rows = db.session.execute(query, {
+                'cutoff_date': cutoff_date,
+                'previous_cutoff': previous_cutoff,
+                'region': region
+            }).all()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseError(f"Failed to count crop mentions: {str(e)}")
+
+        current_counts = {}
+        previous_counts = {}
+        for crop_name, current_count, previous_count in rows:
+            if current_count:
+                current_counts[crop_name] = current_count
+            if previous_count:
+                previous_counts[crop_name] = previous_count
+        return current_counts, previous_counts
+    
+    @staticmethod
+    def _message_stats_sql() -> Optional[Dict[str, str]]:
+        """Hour truncation and confidence rounding expressions for this dialect"""
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            return {
+                'hour_bucket': "date_trunc('hour', m.timestamp)",
+                'confidence_bucket': 'ROUND(CAST(m.confidence_score AS numeric), 1)',
+                'hour_of_day': 'CAST(EXTRACT(HOUR FROM s.hour_bucket) AS integer)'
+            }
+        if dialect == 'sqlite':
+            return {
+                'hour_bucket': "strftime('%Y-%m-%d %H:00:00', m.timestamp)",
+                'confidence_bucket': 'ROUND(m.confidence_score, 1)',
+                'hour_of_day': "CAST(strftime('%H', s.hour_bucket) AS integer)"
+            }
+        return None
+    
+    @staticmethod
+    def refresh_message_stats() -> bool:
+        """Rebuild the message_stats_hourly rollup from messages.
+
+        The whole rollup is recomputed so deleted messages drop out of it;
+        this is a full scan, so it runs on a schedule rather than per
+        request. Returns False when the dialect is not supported or another
+        worker is already refreshing.
+        """
+        sql = AnalyticsRepository._message_stats_sql()
+        if sql is None:
+            return False
+
+        try:
+            if db.engine.dialect.name == 'postgresql':
+                # Serialize refreshes across workers for this transaction
+                locked = db.session.execute(
+                    db.text("SELECT pg_try_advisory_xact_lock(hashtext('message_stats_hourly'))")
+                ).scalar()
+                if not locked:
+                    db.session.rollback()
+                    return False
+
+            # Replaced in one transaction, so readers never see it empty
+            db.session.execute(db.text('DELETE FROM message_stats_hourly'))
+            db.session.execute(db.text(f"""
+                INSERT INTO message_stats_hourly (
+                    hour_bucket, intent_classification, confidence_bucket, message_count,
+                    sentiment_count, sentiment_sum, positive_count, negative_count, neutral_count
+                )
+                SELECT {sql['hour_bucket']},
+                       m.intent_classification,
+                       {sql['confidence_bucket']},
+                       COUNT(*),
+                       COUNT(m.sentiment_score),
+                       SUM(m.sentiment_score),
+                       SUM(CASE WHEN m.sentiment_score > 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN m.sentiment_score < 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN m.sentiment_score = 0 THEN 1 ELSE 0 END)
+                FROM messages m
+                GROUP BY 1, 2, 3
+            """))
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseError(f"Failed to refresh message stats: {str(e)}")
+    
+    @staticmethod
+    def get_message_stats() -> Optional[Dict[str, Any]]:
+        """Intent, hourly, confidence and sentiment totals from the hourly rollup.
+
+        Returns None when the dialect is not supported or the rollup has
+        not been built yet.
+        """
+        sql = AnalyticsRepository._message_stats_sql()
+        if sql is None:
+            return None
+
+        try:
+            built = db.session.execute(
+                db.text('SELECT 1 FROM message_stats_hourly LIMIT 1')
+            ).first()
+            if built is None:
+                return None
+            intents = db.session.execute(db.text("""
+                SELECT s.intent_classification, SUM(s.message_count)
+                FROM message_stats_hourly s
+                WHERE s.intent_classification IS NOT NULL
+                GROUP BY s.intent_classification
+            """)).all()
+            hourly = db.session.execute(db.text(f"""
+                SELECT {sql['hour_of_day']} AS hour, SUM(s.message_count)
+                FROM message_stats_hourly s
+                GROUP BY 1
+            """)).all()
+            confidence = db.session.execute(db.text("""
+                SELECT s.confidence_bucket, SUM(s.message_count)
+                FROM message_stats_hourly s
+                WHERE s.confidence_bucket IS NOT NULL
+                GROUP BY s.confidence_bucket
+            """)).all()
+            sentiment_count, sentiment_sum, positive, negative, neutral = db.session.execute(db.text("""
+                SELECT COALESCE(SUM(s.sentiment_count), 0), SUM(s.sentiment_sum),
+                       COALESCE(SUM(s.positive_count), 0), COALESCE(SUM(s.negative_count), 0),
+                       COALESCE(SUM(s.neutral_count), 0)
+                FROM message_stats_hourly s
+            """)).one()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseError(f"Failed to get message stats: {str(e)}")
+
+        return {
+            'intents': [(intent, int(count)) for intent, count in intents],
+            'hourly': {int(hour): int(count) for hour, count in hourly if hour is not None},
+            'confidence': [(float(score), int(count)) for score, count in confidence],
+            'sentiment': (
+                sentiment_sum / sentiment_count if sentiment_count else None,
+                int(positive), int(negative), int(neutral)
+            )
+        }
+    
     @staticmethod
     def get_comprehensive_analytics(days: int = 30, region: str = 'all') -> Dict[str, Any]:
         """Get comprehensive analytics dashboard data with optional region filtering"""
@@ -457,7 +710,7 @@ class AnalyticsRepository:
             # Get top 10 crops
             crop_trends = [
                 {'crop': crop, 'count': count}
-                for crop, count in sorted(crop_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                for crop, count in heapq.nlargest(10, crop_counts.items(), key=lambda x: x[1])
             ]
 
             # Confidence distribution - group confidence scores into buckets
@@ -112,11 +112,12 @@ class UserRepository:
             ).group_by(User.region).all()
             
             # Active users (last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            now = datetime.utcnow()
+            thirty_days_ago = now - timedelta(days=30)
             active_users = User.query.filter(User.last_active >= thirty_days_ago).count()
             
             # New users (last 7 days)
-            seven_days_ago = datetime.utcnow() - timedelta(days=7)
+            seven_days_ago = now - timedelta(days=7)
             new_users = User.query.filter(User.created_at >= seven_days_ago).count()
             
             return {
@@ -3,7 +3,7 @@
 Seed initial data for AgriBot database
 """
 
-from werkzeug.security import generate_password_hash
+from utils.passwords import hash_password
 from database.models.user import User
 from database.models.crop_knowledge import CropKnowledge
 from database import db_session
@@ -16,7 +16,7 @@ def seed_initial_data():
     admin_data = {
         'name': 'System Administrator',
         'email': 'admin@agribot.cm',
-        'password_hash': generate_password_hash('admin123'),
+        'password_hash': hash_password('admin123'),
         'phone': '+237123456789',
         'region': 'centre',
         'account_type': 'admin',
@@ -32,7 +32,7 @@ def seed_initial_data():
     farmer_data = {
         'name': 'Demo Farmer',
         'email': 'farmer@test.cm',
-        'password_hash': generate_password_hash('farmer123'),
+        'password_hash': hash_password('farmer123'),
         'phone': '+237987654321',
         'region': 'littoral',
         'account_type': 'user',
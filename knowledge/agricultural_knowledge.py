@@ -26,6 +26,10 @@ class AgriculturalKnowledgeBase:
         self.harvest_timing = self._load_harvest_timing()
         self.response_templates = self._load_response_templates()
     
+    def get_all_crops(self) -> List[str]:
+        """Get names of all crops in the knowledge base"""
+        return self.crop_db.get_available_crops()
+    
     def get_comprehensive_crop_info(self, crop: str) -> Dict[str, Any]:
         """Get all available information about a specific crop"""
         crop_info = {
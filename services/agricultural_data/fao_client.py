@@ -11,13 +11,15 @@ import time
 from typing import Dict, Optional, List
 from config.settings import APIConfig
 from services.cache.redis_cache import RedisCache, cached
+from services.http_session import get_http_session
 from utils.exceptions import APIServiceError
 
 class FAOClient:
     """Client for FAO FAOSTAT API integration"""
     
-    def __init__(self, config: APIConfig = None):
+    def __init__(self, config: APIConfig = None, session: requests.Session = None):
         self.config = config or APIConfig()
+        self.session = session or get_http_session()
         self.base_url = self.config.fao_base_url
         self.cache = RedisCache()
         
@@ -62,7 +64,7 @@ class FAOClient:
         
         for attempt in range(self.config.max_retries):
             try:
-                response = requests.get(
+                response = self.session.get(
                     url,
                     params=params,
                     timeout=self.config.timeout
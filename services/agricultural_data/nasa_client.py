@@ -11,13 +11,15 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from config.settings import APIConfig
 from services.cache.redis_cache import RedisCache, cached
+from services.http_session import get_http_session
 from utils.exceptions import APIServiceError
 
 class NASAClient:
     """Client for NASA POWER API integration"""
     
-    def __init__(self, config: APIConfig = None):
+    def __init__(self, config: APIConfig = None, session: requests.Session = None):
         self.config = config or APIConfig()
+        self.session = session or get_http_session()
         self.base_url = self.config.nasa_base_url
         self.cache = RedisCache()
         
@@ -52,7 +54,7 @@ class NASAClient:
         
         for attempt in range(self.config.max_retries):
             try:
-                response = requests.get(
+                response = self.session.get(
                     url,
                     params=params,
                     timeout=self.config.timeout
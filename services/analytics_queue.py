@@ -0,0 +1,112 @@
+"""
+Analytics Event Queue
+Location: agribot/services/analytics_queue.py
+
+Buffers analytics events in memory and writes them from a background
+thread in batches, so request handlers do not wait on a database commit
+for every event they log.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class AnalyticsEventQueue:
+    """Batching writer for Analytics events"""
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._app = None
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Bind the queue to an app so the worker can open app contexts"""
+        self._app = app
+        atexit.register(self.flush)
+
+    def log_event(self, event_type: str, event_data: Dict = None, user_id: int = None):
+        """Queue an analytics event for the next batch write"""
+        event = {
+            'event_type': event_type,
+            'event_data': event_data,
+            'user_id': user_id,
+            'timestamp': datetime.now(timezone.utc)
+        }
+        if self._app is None:
+            # No app bound (scripts, shell): write immediately
+            self._write([event])
+            return
+        self._queue.put(event)
+        self._ensure_worker()
+
+    def flush(self):
+        """Write every queued event now"""
+        batch = self._drain()
+        while batch:
+            self._write(batch)
+            batch = self._drain()
+
+    def _ensure_worker(self):
+        """Start the writer thread once per process (workers may be forked)"""
+        pid = os.getpid()
+        if self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker_pid != pid or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='analytics-event-writer', daemon=True
+                )
+                self._worker_pid = pid
+                self._worker.start()
+
+    def _drain(self, first=None):
+        """Collect up to batch_size queued events"""
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            # Give concurrent requests a moment to add to the same batch
+            time.sleep(self.flush_interval)
+            self._write(self._drain(first))
+
+    def _write(self, events):
+        """Insert events with a single executemany"""
+        if self._app is None:
+            self._insert(events)
+            return
+        with self._app.app_context():
+            self._insert(events)
+
+    @staticmethod
+    def _insert(events):
+        from sqlalchemy import insert
+        from database import db
+        from database.models.analytics import Analytics
+
+        try:
+            db.session.execute(insert(Analytics), events)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Failed to write %d analytics events: %s", len(events), e)
+
+# Shared queue used by the route handlers
+analytics_events = AnalyticsEventQueue()
@@ -0,0 +1,104 @@
+"""
+Background Jobs
+Location: agribot/services/background_jobs.py
+
+Runs slow request work (such as calls to external analysis APIs) on a
+small thread pool inside an app context. Callers get a job id at once
+and poll for the result, which is kept in the background_jobs table so
+any worker process can answer the poll.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Sequence
+import logging
+import uuid
+
+from database import db
+from database.models.jobs import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+def _owner(user_id) -> Optional[str]:
+    """Session user ids are ints or uuid strings; store them as text"""
+    return str(user_id) if user_id is not None else None
+
+class BackgroundJobs:
+    """Thread-pool runner whose job states are kept in the database"""
+
+    def __init__(self, kind: str, max_workers: int = 4, ttl: int = 3600):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._app = None
+        self._executor = None
+
+    def init_app(self, app):
+        """Bind the runner to an app so jobs can open app contexts"""
+        self._app = app
+
+    def submit(self, func: Callable, *args: Any, user_id=None) -> str:
+        """Queue func(*args) and return the job id"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f'{self.kind}-job'
+            )
+        self._remove_expired()
+
+        job_id = uuid.uuid4().hex
+        db.session.add(BackgroundJob(
+            id=job_id, kind=self.kind, status='pending', user_id=_owner(user_id)
+        ))
+        db.session.commit()
+        self._executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def get(self, job_id: str, user_id=None) -> Optional[Dict]:
+        """Get the status and result of a live job owned by user_id"""
+        job = BackgroundJob.query.filter(
+            BackgroundJob.id == job_id,
+            BackgroundJob.kind == self.kind,
+            BackgroundJob.user_id == _owner(user_id),
+            BackgroundJob.created_at >= self._cutoff()
+        ).first()
+        if not job:
+            return None
+        return {'status': job.status, 'result': job.get_result()}
+
+    def _execute(self, job_id: str, func: Callable, args: Sequence) -> Dict:
+        """Do the work of one job, returning its JSON-serializable result"""
+        return func(*args)
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+
+    def _save(self, job_id: str, status: str, result: Dict = None, error: str = None):
+        job = db.session.get(BackgroundJob, job_id)
+        if job is None:
+            return
+        job.status = status
+        if result is not None:
+            job.set_result(result)
+        job.error = error
+        db.session.commit()
+
+    def _run(self, job_id, func, args):
+        with self._app.app_context():
+            try:
+                self._save(job_id, 'done', result=self._execute(job_id, func, args))
+            except Exception as e:
+                # The cause stays server-side; status polls only see 'failed'
+                logger.exception("%s job %s failed: %s", self.kind, job_id, e)
+                db.session.rollback()
+                self._save(job_id, 'failed', error=str(e))
+
+    def _remove_expired(self):
+        """Delete this runner's jobs older than the TTL"""
+        BackgroundJob.query.filter(
+            BackgroundJob.kind == self.kind,
+            BackgroundJob.created_at < self._cutoff()
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+# Plant image analysis calls an external API; run it off the request thread
+image_analysis_jobs = BackgroundJobs('image_analysis', max_workers=4)
@@ -41,6 +41,11 @@ class RedisCache:
                 f"Failed to connect to Redis cache: {str(e)}"
             )
     
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """Underlying Redis client, for sharing its connection pool"""
+        return self._client
+    
     def _make_key(self, key: str) -> str:
         """Create prefixed cache key"""
         return f"{self.config.key_prefix}{key}"
@@ -89,6 +94,26 @@ class RedisCache:
             print(f"Cache set error for key {key}: {str(e)}")
             return False
     
+    def set_many(self, mapping: dict, timeout: int = None) -> bool:
+        """Set several values in one round-trip using a pipeline"""
+        if not self.config.enabled or not self._client:
+            return False
+        
+        try:
+            timeout = timeout or self.config.default_timeout
+            with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    try:
+                        serialized_value = json.dumps(value, default=str)
+                    except TypeError:
+                        serialized_value = pickle.dumps(value)
+                    pipe.setex(self._make_key(key), timeout, serialized_value)
+                return all(pipe.execute())
+            
+        except Exception as e:
+            print(f"Cache set_many error for keys {list(mapping)}: {str(e)}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self.config.enabled or not self._client:
@@ -39,6 +39,16 @@ class SimpleCache:
             except Exception:
                 return False
 
+    def set_many(self, mapping: dict, timeout: int = 300) -> bool:
+        """Set several values in cache with the same timeout"""
+        with self._lock:
+            expires_at = datetime.now() + timedelta(seconds=timeout) if timeout else None
+            for key, value in mapping.items():
+                self._cache[key] = value
+                if expires_at:
+                    self._timeouts[key] = expires_at
+            return True
+
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         with self._lock:
@@ -98,6 +108,11 @@ def get_cache():
 # Singleton instance for easy import
 cache = get_cache()
 
+# Account types back admin checks, so they are only cached where a change
+# can be cleared for every worker; in-process caches would keep a demoted
+# admin's role alive in the other workers
+_SHARE_ACCOUNT_TYPES = not isinstance(cache, SimpleCache)
+
 # Helper functions for compatibility
 def cache_user_session(user_id: int, user_data: dict, timeout: int = 3600):
     """Cache user session data"""
@@ -113,3 +128,29 @@ def clear_user_session(user_id: int):
     """Clear user session from cache"""
     key = f"session:{user_id}"
     return cache.delete(key)
+
+def _account_type_key(user_id: int) -> str:
+    return f"user:{user_id}:account_type"
+
+def cache_login(user_id: int, user_data: dict, timeout: int = 3600):
+    """Cache session data and account type together in one round-trip"""
+    mapping = {f"session:{user_id}": user_data}
+    if _SHARE_ACCOUNT_TYPES:
+        mapping[_account_type_key(user_id)] = user_data['account_type']
+    return cache.set_many(mapping, timeout)
+
+def get_cached_account_type(user_id: int) -> Optional[str]:
+    """Get cached account type used by admin checks"""
+    if not _SHARE_ACCOUNT_TYPES:
+        return None
+    return cache.get(_account_type_key(user_id))
+
+def cache_account_type(user_id: int, account_type: str, timeout: int = 300):
+    """Cache account type used by admin checks"""
+    if not _SHARE_ACCOUNT_TYPES:
+        return False
+    return cache.set(_account_type_key(user_id), account_type, timeout)
+
+def clear_cached_account_type(user_id: int):
+    """Forget a cached account type after the user changes"""
+    return cache.delete(_account_type_key(user_id))
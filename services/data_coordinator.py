@@ -463,12 +463,20 @@ class DataCoordinator:
         """Compare agricultural conditions across multiple regions"""
         comparison_data = {}
         
-        for region in regions:
-            try:
-                region_analysis = self.get_comprehensive_analysis(region, crop, include_forecast=False)
-                comparison_data[region] = region_analysis
-            except Exception as e:
-                comparison_data[region] = {'error': str(e)}
+        if regions:
+            # Regions are independent and I/O-bound, so fetch them concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(regions), 10)) as executor:
+                futures = {
+                    region: executor.submit(self.get_comprehensive_analysis, region, crop, False)
+                    for region in regions
+                }
+                
+                # Collect results in the requested order
+                for region, future in futures.items():
+                    try:
+                        comparison_data[region] = future.result()
+                    except Exception as e:
+                        comparison_data[region] = {'error': str(e)}
         
         return {
             'comparison_type': 'multi_region',
@@ -0,0 +1,83 @@
+"""
+Export Jobs
+Location: agribot/services/export_jobs.py
+
+Runs large dataset exports on the background job runner and writes the
+result to a file, so the admin request returns a job id at once and
+polls for the finished download instead of holding a web worker and a
+database connection for the whole export.
+"""
+
+from typing import Callable, Dict, Sequence
+import os
+import time
+
+from services.background_jobs import BackgroundJobs
+
+class ExportJobs(BackgroundJobs):
+    """Background runner for export views"""
+
+    def __init__(self, max_workers: int = 2, ttl: int = 3600):
+        # A small pool bounds how many database connections exports hold
+        super().__init__('export', max_workers=max_workers, ttl=ttl)
+        # Outputs are files, so status polls work on any worker of this host
+        self.export_dir = os.path.join(os.getcwd(), 'exports')
+
+    def init_app(self, app):
+        """Bind the runner to an app so jobs can open request contexts"""
+        super().init_app(app)
+        self.export_dir = app.config.get('EXPORT_DIR', self.export_dir)
+
+    def submit(self, view: Callable, path: str, query_string: Dict,
+               base_url: str = None, user_id=None) -> str:
+        """Queue view to run as if requested at base_url + path, returning the job id"""
+        return super().submit(view, path, query_string, base_url, user_id=user_id)
+
+    def file_path(self, job_id: str) -> str:
+        """Location of a finished job's output"""
+        return os.path.join(self.export_dir, f'{job_id}.export')
+
+    def _execute(self, job_id: str, view: Callable, args: Sequence) -> Dict:
+        """Run the view in a request context and write its body to the output file"""
+        path, query_string, base_url = args
+        os.makedirs(self.export_dir, exist_ok=True)
+        final_path = self.file_path(job_id)
+        partial_path = final_path + '.part'
+
+        with self._app.test_request_context(path, base_url=base_url, query_string=query_string):
+            response = self._app.make_response(view())
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"export view returned {response.status_code}: {response.get_data(as_text=True)}"
+                )
+
+            try:
+                with open(partial_path, 'wb') as f:
+                    for chunk in response.iter_encoded():
+                        f.write(chunk)
+                os.replace(partial_path, final_path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.unlink(partial_path)
+
+            return {
+                'mimetype': response.mimetype,
+                'content_disposition': response.headers.get('Content-Disposition')
+            }
+
+    def _remove_expired(self):
+        """Delete job rows and outputs older than the job TTL"""
+        super()._remove_expired()
+        if not os.path.isdir(self.export_dir):
+            return
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.export_dir):
+            path = os.path.join(self.export_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+            except OSError:
+                pass
+
+# Shared runner used by the export routes
+export_jobs = ExportJobs()
@@ -0,0 +1,28 @@
+"""
+Shared HTTP Session
+Location: agribot/services/http_session.py
+
+Process-wide requests.Session with a pooled adapter, so the external API
+clients reuse keep-alive connections (and TLS sessions) across calls.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Clients implement their own retry loops, so the adapter does not retry
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
@@ -6,6 +6,7 @@ Handles plant disease identification using Claude Vision API
 import os
 import requests
 import base64
+import hashlib
 import logging
 from typing import Dict, Optional, List
 try:
@@ -15,8 +16,25 @@ except Exception:
     anthropic = None
     _HAS_ANTHROPIC = False
 
+try:
+    # Enables HTTP/2 in httpx
+    import h2  # noqa: F401
+    _HAS_HTTP2 = True
+except ImportError:
+    _HAS_HTTP2 = False
+
+from services.cache.simple_cache import cache
+
 logger = logging.getLogger(__name__)
 
+# Re-uploads of the same photo reuse the earlier analysis for a week
+RESULT_CACHE_TTL = 7 * 24 * 3600
+
+
+def image_digest(image_data: bytes) -> str:
+    """SHA-256 hex digest identifying an image's content"""
+    return hashlib.sha256(image_data).hexdigest()
+
 
 class PlantIdService:
     """Service for plant disease identification using Claude Vision API"""
@@ -29,20 +47,35 @@ class PlantIdService:
         # Initialize Anthropic client if API key is available
         if _HAS_ANTHROPIC and self.api_key and self.api_key != 'your_api_key_here':
             try:
-                self.client = anthropic.Anthropic(api_key=self.api_key)
+                self.client = anthropic.Anthropic(
+                    api_key=self.api_key, http_client=self._build_http_client(self.timeout)
+                )
             except Exception as e:
                 logger.error(f"Failed to initialize Anthropic client: {str(e)}")
                 self.client = None
         else:
             self.client = None
 
-    def identify_health(self, image_data: bytes, language: str = 'en') -> Dict:
+    @staticmethod
+    def _build_http_client(timeout: float):
+        """Pooled client with the SDK's defaults, on HTTP/2 when h2 is installed"""
+        # Build Limits from the SDK's own HTTP library rather than importing it
+        limits_type = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+        return anthropic.DefaultHttpxClient(
+            http2=_HAS_HTTP2,
+            timeout=float(timeout),
+            limits=limits_type(max_connections=20, max_keepalive_connections=20)
+        )
+
+    def identify_health(self, image_data: bytes, language: str = 'en',
+                        digest: Optional[str] = None) -> Dict:
         """
         Identify plant health issues from image using Claude Vision API
 
         Args:
             image_data: Image file bytes
             language: Language code (en, fr, pcm)
+            digest: image_digest(image_data), if the caller already has it
 
         Returns:
             Dictionary with disease identification results
@@ -50,6 +83,19 @@ class PlantIdService:
         if not self.client:
             return self._get_fallback_response(language, 'Claude API key not configured')
 
+        cache_key = f"plantid:{digest or image_digest(image_data)}:{language}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        health_data = self._analyze(image_data, language)
+        # Fallbacks describe a failed call, so the next upload should retry
+        if not health_data.get('fallback'):
+            cache.set(cache_key, health_data, timeout=RESULT_CACHE_TTL)
+        return health_data
+
+    def _analyze(self, image_data: bytes, language: str) -> Dict:
+        """Send the image to Claude Vision and parse the result"""
         try:
             # Encode image to base64
             image_base64 = base64.b64encode(image_data).decode('ascii')
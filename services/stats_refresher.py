@@ -0,0 +1,65 @@
+"""
+Message Stats Refresher
+Location: agribot/services/stats_refresher.py
+
+Rebuilds the hourly message statistics rollup from a background thread
+on a fixed interval, so the analytics endpoints only read the rollup and
+deleted conversations drop out of it at the next rebuild.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class MessageStatsRefresher:
+    """Periodic rebuild of the message_stats_hourly rollup"""
+
+    def __init__(self, interval: float = 300.0):
+        self.interval = interval
+        self._app = None
+        self._worker = None
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Bind the refresher to an app and start rebuilding in the background"""
+        self._app = app
+        self.interval = app.config.get('MESSAGE_STATS_REFRESH_SECONDS', self.interval)
+        # Threads do not survive a fork, so check again on each request
+        app.before_request(self._ensure_worker)
+        self._ensure_worker()
+
+    def refresh(self):
+        """Rebuild the rollup now"""
+        from database.repositories.analytics_repository import AnalyticsRepository
+        from utils.exceptions import DatabaseError
+
+        with self._app.app_context():
+            try:
+                AnalyticsRepository.refresh_message_stats()
+            except DatabaseError as e:
+                logger.warning("Message stats refresh failed: %s", e)
+
+    def _ensure_worker(self):
+        """Start the refresh thread once per process (workers may be forked)"""
+        pid = os.getpid()
+        if self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker_pid != pid or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='message-stats-refresher', daemon=True
+                )
+                self._worker_pid = pid
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            time.sleep(self.interval)
+
+# Shared refresher started by the app factory
+message_stats_refresher = MessageStatsRefresher()
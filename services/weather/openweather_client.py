@@ -11,13 +11,15 @@ from typing import Dict, Optional, List
 from config.settings import APIConfig
 from services.cache.redis_cache import RedisCache, cached
 from config.settings import CacheConfig
+from services.http_session import get_http_session
 from utils.exceptions import APIServiceError
 
 class OpenWeatherClient:
     """Client for OpenWeatherMap API integration"""
     
-    def __init__(self, config: APIConfig = None):
+    def __init__(self, config: APIConfig = None, session: requests.Session = None):
         self.config = config or APIConfig()
+        self.session = session or get_http_session()
         self.base_url = "http://api.openweathermap.org/data/2.5"
 
         # Only initialize cache if caching is enabled
@@ -58,7 +60,7 @@ class OpenWeatherClient:
         
         for attempt in range(self.config.max_retries):
             try:
-                response = requests.get(
+                response = self.session.get(
                     url, 
                     params=params, 
                     timeout=self.config.timeout
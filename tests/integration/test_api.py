@@ -1,4 +1,241 @@
 """
 test_api.py - AgriBot tests/integration module
-TODO: Implement this module
+
+Exercises API routes against an in-memory SQLite database.
 """
+
+import io
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from database import db, init_db
+from database.models.analytics import Feedback
+from database.models.conversation import Conversation, Message
+from database.models.user import AccountType, User
+from database.repositories.analytics_repository import AnalyticsRepository
+from services.cache.simple_cache import cache_login
+from app.routes.auth import auth_bp
+from app.routes.admin import admin_bp
+from app.routes.chat import chat_bp
+from services.background_jobs import image_analysis_jobs
+from services.export_jobs import export_jobs
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+    })
+    init_db(app)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(chat_bp, url_prefix='/chat')
+    app.register_blueprint(admin_bp, url_prefix='/admin')
+    export_jobs.init_app(app)
+    image_analysis_jobs.init_app(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def admin_client(app):
+    admin = User(name='Admin', email='admin@example.com', password_hash='x',
+                 account_type=AccountType.ADMIN)
+    db.session.add(admin)
+    db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = admin.id
+        sess['account_type'] = 'admin'
+        sess['admin_verified_at'] = time.time()
+    return client, admin
+
+
+def test_ml_export_with_session_id_feedback(admin_client):
+    """Feedback keyed by a frontend session id must not break the export"""
+    client, admin = admin_client
+    conversation = Conversation(user_id=admin.id, region='centre')
+    db.session.add(conversation)
+    db.session.flush()
+
+    asked_at = datetime(2024, 5, 1, 10, 0)
+    db.session.add_all([
+        Message(conversation_id=conversation.id, content='How do I plant maize?',
+                message_type='user', timestamp=asked_at),
+        Message(conversation_id=conversation.id, content='Plant at the start of the rains.',
+                message_type='bot', timestamp=asked_at + timedelta(seconds=5)),
+        # /chat/feedback stores the frontend session id in conversation_id
+        Feedback(conversation_id='session_abc', user_id=admin.id, helpful=True,
+                 overall_rating=5, timestamp=datetime(2024, 5, 3, 9, 0)),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/auth/admin/export/ml-dataset'
+                          '?start_date=2024-05-01&end_date=2024-05-01')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['dataset_size'] == 1
+    entry = body['data'][0]
+    assert entry['user_question'] == 'How do I plant maize?'
+    assert entry['bot_response'] == 'Plant at the start of the rains.'
+    # Matched to the user's feedback, which arrived after the end date
+    assert entry['has_feedback'] == 'Yes'
+    assert entry['feedback_overall_rating'] == 5
+
+
+@pytest.mark.parametrize('path', ['/chat/message-with-image', '/chat/analyze-image'])
+def test_oversize_image_upload_is_413(app, path):
+    """Bodies over MAX_CONTENT_LENGTH are refused, not turned into a 500"""
+    app.config['MAX_CONTENT_LENGTH'] = 1024
+    response = app.test_client().post(path, data={
+        'message': 'What is wrong with this leaf?',
+        'image': (io.BytesIO(b'\0' * 4096), 'leaf.jpg'),
+    })
+
+    assert response.status_code == 413
+
+
+def test_cache_clear_requires_admin(app, admin_client):
+    """Anonymous clients cannot flush the response caches"""
+    assert app.test_client().post('/admin/cache/clear').status_code == 401
+
+    client, _ = admin_client
+    assert client.post('/admin/cache/clear').status_code == 200
+
+
+def test_cache_stats_requires_admin(app, admin_client):
+    """Cache statistics are only shown to admins"""
+    assert app.test_client().get('/admin/cache/stats').status_code == 401
+
+    client, _ = admin_client
+    assert client.get('/admin/cache/stats').get_json()['success'] is True
+
+
+def _wait_for_job(client, status_url, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(status_url).get_json()
+        if body['status'] != 'pending':
+            return body
+        time.sleep(0.05)
+    raise AssertionError('job did not finish')
+
+
+def test_async_export_state_is_kept_in_the_database(app, admin_client, tmp_path):
+    """Export job state is read from the shared table, not process memory"""
+    app.config['EXPORT_DIR'] = str(tmp_path)
+    export_jobs.init_app(app)
+    client, _ = admin_client
+
+    response = client.get('/api/auth/admin/export/feedback-dataset?async=1&format=csv')
+    assert response.status_code == 202
+    status_url = response.get_json()['status_url']
+
+    status = _wait_for_job(client, status_url)
+    assert status['status'] == 'done'
+    assert client.get(status['download_url']).status_code == 200
+
+    # Another admin cannot see the job
+    with client.session_transaction() as sess:
+        sess['user_id'] = 999
+    assert client.get(status_url).status_code == 404
+
+
+def test_image_analysis_status_reads_shared_job_state(app):
+    """Analysis results are served from the job table to the job's owner"""
+    job_id = image_analysis_jobs.submit(lambda: {'success': True, 'data': {'response': 'Healthy'}},
+                                        user_id='guest-1')
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 'guest-1'
+
+    status_url = f'/chat/analyze-image/status/{job_id}'
+    deadline = time.time() + 10
+    while (response := client.get(status_url)).status_code == 202 and time.time() < deadline:
+        time.sleep(0.05)
+    assert response.status_code == 200
+    assert response.get_json()['data']['response'] == 'Healthy'
+
+    with client.session_transaction() as sess:
+        sess['user_id'] = 'guest-2'
+    assert client.get(status_url).status_code == 404
+
+
+def test_demoted_admin_loses_access_at_next_recheck(admin_client):
+    """A role cached at login does not outlive a demotion"""
+    client, admin = admin_client
+    cache_login(admin.id, {'account_type': 'admin'})
+    admin.account_type = AccountType.USER
+    db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess['admin_verified_at'] = 0
+    assert client.get('/admin/cache/stats').status_code == 403
+
+
+def test_deleted_conversation_leaves_message_stats(admin_client):
+    """Rebuilding the rollup drops messages of deleted conversations"""
+    client, admin = admin_client
+    now = datetime.utcnow()
+    kept, deleted = Conversation(user_id=admin.id), Conversation(user_id=admin.id)
+    db.session.add_all([kept, deleted])
+    db.session.flush()
+    db.session.add_all([
+        Message(conversation_id=kept.id, content='When do I plant?', message_type='user',
+                intent_classification='planting', timestamp=now),
+        Message(conversation_id=deleted.id, content='My maize is sick', message_type='user',
+                intent_classification='disease', timestamp=now - timedelta(hours=5)),
+    ])
+    db.session.commit()
+    AnalyticsRepository.refresh_message_stats()
+
+    assert client.delete(f'/chat/conversations/{deleted.id}').status_code == 200
+    AnalyticsRepository.refresh_message_stats()
+
+    assert AnalyticsRepository.get_message_stats()['intents'] == [('planting', 1)]
+
+
+@pytest.fixture
+def legacy_user(app):
+    user = User(name='Farmer', email='farmer@example.com',
+                password_hash=generate_password_hash('maize-season'))
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_login_upgrades_werkzeug_hash(app, legacy_user):
+    """Accounts hashed by werkzeug still log in and move to bcrypt"""
+    response = app.test_client().post('/api/auth/login', json={
+        'email': 'farmer@example.com', 'password': 'maize-season'
+    })
+
+    assert response.status_code == 200
+    db.session.refresh(legacy_user)
+    assert legacy_user.password_hash.startswith('$2b$')
+
+
+def test_login_with_wrong_password_is_401(app, legacy_user):
+    response = app.test_client().post('/api/auth/login', json={
+        'email': 'farmer@example.com', 'password': 'cassava-season'
+    })
+
+    assert response.status_code == 401
+
+
+def test_login_with_unknown_email_is_401(app):
+    response = app.test_client().post('/api/auth/login', json={
+        'email': 'nobody@example.com', 'password': 'maize-season'
+    })
+
+    assert response.status_code == 401
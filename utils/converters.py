@@ -0,0 +1,28 @@
+"""
+URL Converters
+Location: agribot/utils/converters.py
+
+Werkzeug URL converters that validate crop and region path segments
+during routing, so invalid names never reach the view functions.
+"""
+
+import re
+from werkzeug.routing import BaseConverter
+
+from utils.validators import SUPPORTED_CROPS, MAX_REGION_LENGTH
+
+class CropConverter(BaseConverter):
+    """Match only supported crop names (case-insensitive)"""
+
+    regex = '(?i:' + '|'.join(re.escape(crop) for crop in SUPPORTED_CROPS) + ')'
+
+class RegionConverter(BaseConverter):
+    """Match any region name with a non-space character, within the accepted length"""
+
+    # The lookahead rejects whitespace-only names, as validate_region does
+    regex = r'(?=[^/]*[^/\s])[^/]{1,%d}' % MAX_REGION_LENGTH
+
+def register_converters(url_map):
+    """Register the crop and region converters on a URL map"""
+    url_map.converters.setdefault('crop', CropConverter)
+    url_map.converters.setdefault('region', RegionConverter)
@@ -0,0 +1,50 @@
+"""
+Password Hashing
+Location: agribot/utils/passwords.py
+
+Password hashing with bcrypt at a tuned work factor. Hashes created by
+werkzeug (pbkdf2/scrypt) are still verified so existing accounts keep
+working, and are upgraded on the next successful login.
+"""
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    import bcrypt
+    _HAS_BCRYPT = True
+except ImportError:
+    bcrypt = None
+    _HAS_BCRYPT = False
+
+# Work factor 11 keeps a verify around 100-150 ms on typical hosts
+BCRYPT_ROUNDS = 11
+
+_BCRYPT_PREFIXES = ('$2b$', '$2a$', '$2y$')
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt, or werkzeug when bcrypt is unavailable"""
+    if _HAS_BCRYPT:
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
+    return generate_password_hash(password)
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Check a password against a bcrypt or legacy werkzeug hash"""
+    if not password_hash:
+        return False
+    if password_hash.startswith(_BCRYPT_PREFIXES):
+        if not _HAS_BCRYPT:
+            return False
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+        except ValueError:
+            return False
+    return check_password_hash(password_hash, password)
+
+def needs_rehash(password_hash: str) -> bool:
+    """Whether a stored hash should be upgraded to the current scheme"""
+    if not _HAS_BCRYPT:
+        return False
+    if not password_hash.startswith(_BCRYPT_PREFIXES):
+        return True
+    return int(password_hash.split('$')[2]) != BCRYPT_ROUNDS
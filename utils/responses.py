@@ -0,0 +1,154 @@
+"""
+Response Helpers
+Location: agribot/utils/responses.py
+
+Helpers for building JSON responses: fast serialization, streaming,
+caching headers and content negotiation for the API routes.
+"""
+
+import gzip
+import hashlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Tuple
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    import json
+    orjson = None
+    _HAS_ORJSON = False
+
+try:
+    import msgspec
+    _HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None
+    _HAS_MSGSPEC = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def _default(value: Any) -> Any:
+    """Fallback encoder; orjson handles datetimes natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def dumps(payload: Any) -> bytes:
+    """Serialize payload to compact JSON bytes"""
+    if _HAS_ORJSON:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode('utf-8')
+
+if _HAS_MSGSPEC:
+    _msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_default)
+
+def wants_msgpack() -> bool:
+    """Whether the client prefers MessagePack over JSON"""
+    if not _HAS_MSGSPEC:
+        return False
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE, MSGPACK_MIMETYPE))
+    return best == MSGPACK_MIMETYPE
+
+def packb(payload: Any) -> bytes:
+    """Serialize payload to MessagePack bytes"""
+    return _msgpack_encoder.encode(payload)
+
+def error_body(message: str, **extra: Any) -> bytes:
+    """Serialize a standard error envelope to JSON bytes"""
+    return dumps({'success': False, 'error': message, **extra})
+
+def raw_json_response(body: bytes, status: int = 200) -> Response:
+    """Wrap already-serialized JSON bytes in a response"""
+    return Response(body, status=status, mimetype=JSON_MIMETYPE)
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Serialize payload and wrap it in a JSON response"""
+    return Response(dumps(payload), status=status, mimetype=JSON_MIMETYPE)
+
+def negotiated_response(payload: Any, status: int = 200) -> Response:
+    """Serialize payload as MessagePack or JSON depending on the Accept header"""
+    if wants_msgpack():
+        response = Response(packb(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = json_response(payload, status)
+    response.vary.add('Accept')
+    return response
+
+def error_response(message: str, status: int, **extra: Any) -> Response:
+    """Build a standard error response for a dynamic message"""
+    return Response(error_body(message, **extra), status=status, mimetype=JSON_MIMETYPE)
+
+def etag_for(body: bytes) -> str:
+    """Derive a short, stable ETag from serialized bytes"""
+    return hashlib.md5(body).hexdigest()[:16]
+
+def cached_json_response(body: bytes, etag: str, max_age: int = None) -> Response:
+    """Serve fixed JSON bytes, answering If-None-Match with 304"""
+    response = Response(body, mimetype=JSON_MIMETYPE)
+    response.set_etag(etag)
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def precompress(body: bytes) -> Tuple[bytes, bytes]:
+    """Pair JSON bytes with a gzip-compressed copy"""
+    return body, gzip.compress(body, compresslevel=6, mtime=0)
+
+def negotiated_json_response(blobs: Tuple[bytes, bytes], status: int = 200) -> Response:
+    """Serve precompressed JSON when the client accepts gzip"""
+    body, gzipped = blobs
+    if request.accept_encodings['gzip']:
+        response = Response(gzipped, status=status, mimetype=JSON_MIMETYPE)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, status=status, mimetype=JSON_MIMETYPE)
+    response.vary.add('Accept-Encoding')
+    return response
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    Output matches the default provider: dates still go through Flask's
+    encoder, and debug responses are still pretty-printed.
+    """
+
+    def _orjson_dumps(self, obj: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not _HAS_ORJSON or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if not _HAS_ORJSON or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b'\n', mimetype=self.mimetype)
+
+def _iter_sections(sections: Dict[str, Any]) -> Iterator[bytes]:
+    """Yield a success envelope, serializing one data section at a time"""
+    yield b'{"success":true,"data":{'
+    for index, (key, value) in enumerate(sections.items()):
+        if index:
+            yield b','
+        yield dumps(str(key))
+        yield b':'
+        yield dumps(value)
+    yield b'}}'
+
+def success_body(sections: Dict[str, Any]) -> bytes:
+    """Serialize a success envelope around data sections to JSON bytes"""
+    return b''.join(_iter_sections(sections))
+
+def streamed_json_response(sections: Dict[str, Any], status: int = 200) -> Response:
+    """Stream a success envelope without materializing the whole body"""
+    return Response(_iter_sections(sections), status=status, mimetype=JSON_MIMETYPE)
@@ -8,6 +8,31 @@ Validation functions for user input and API parameters.
 import re
 from typing import Dict, Any, List
 
+# Crops supported by the knowledge-backed API endpoints
+SUPPORTED_CROPS = (
+    'maize', 'cassava', 'plantain', 'cocoa', 'coffee', 'rice', 'yam',
+    'beans', 'groundnuts', 'tomatoes', 'pepper', 'okra', 'onion',
+    'banana', 'pineapple', 'mango', 'avocado', 'cotton', 'oil_palm'
+)
+_SUPPORTED_CROP_SET = frozenset(SUPPORTED_CROPS)
+
+# Regions served by the region-aware API endpoints
+SUPPORTED_REGIONS = (
+    'centre', 'littoral', 'west', 'northwest', 'southwest',
+    'east', 'north', 'far_north', 'adamawa', 'south'
+)
+
+# Upper bound on region name length accepted by validate_region
+MAX_REGION_LENGTH = 100
+
+# Patterns compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)]')
+# Cameroon mobile numbers: +237XXXXXXXXX, 237XXXXXXXXX or XXXXXXXXX,
+# starting with 6, 7, 8, or 9
+_PHONE_RE = re.compile(r'^(?:\+?237)?[6789]\d{8}$')
+_NAME_RE = re.compile(r"^[a-zA-ZÀ-ÿ\s\-']+$")
+
 def validate_chat_input(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate chat input data"""
     result = {'valid': True, 'error': None}
@@ -50,26 +75,19 @@ def validate_region(region: str) -> bool:
 
     # Basic validation: must be non-empty and reasonable length
     region = region.strip()
-    return len(region) > 0 and len(region) <= 100
+    return len(region) > 0 and len(region) <= MAX_REGION_LENGTH
 
 def validate_crop(crop: str) -> bool:
     """Validate if crop is supported"""
     # This is a simplified validation - in practice would check against knowledge base
-    supported_crops = [
-        'maize', 'cassava', 'plantain', 'cocoa', 'coffee', 'rice', 'yam',
-        'beans', 'groundnuts', 'tomatoes', 'pepper', 'okra', 'onion',
-        'banana', 'pineapple', 'mango', 'avocado', 'cotton', 'oil_palm'
-    ]
-    
-    return crop.lower().strip() in supported_crops
+    return crop.lower().strip() in _SUPPORTED_CROP_SET
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
     if not email:
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def validate_password(password: str) -> bool:
     """Validate password strength"""
@@ -90,17 +108,9 @@ def validate_phone(phone: str) -> bool:
         return True  # Phone is optional
     
     # Remove spaces and common separators
-    clean_phone = re.sub(r'[\s\-\(\)]', '', phone)
-    
-    # Cameroon phone pattern: +237XXXXXXXXX or 237XXXXXXXXX or XXXXXXXXX
-    # Mobile numbers start with 6, 7, 8, or 9
-    patterns = [
-        r'^\+237[6789]\d{8}$',  # +237XXXXXXXXX
-        r'^237[6789]\d{8}$',    # 237XXXXXXXXX
-        r'^[6789]\d{8}$'        # XXXXXXXXX
-    ]
+    clean_phone = _PHONE_SEPARATORS_RE.sub('', phone)
     
-    return any(re.match(pattern, clean_phone) for pattern in patterns)
+    return _PHONE_RE.match(clean_phone) is not None
 
 def validate_name(name: str) -> bool:
     """Validate user name"""
@@ -112,8 +122,7 @@ def validate_name(name: str) -> bool:
         return False
     
     # Allow letters, spaces, hyphens, apostrophes
-    pattern = r"^[a-zA-ZÀ-ÿ\s\-']+$"
-    return re.match(pattern, name.strip()) is not None
+    return _NAME_RE.match(name.strip()) is not None
 
 def validate_user_registration(data: Dict[str, Any]) -> Dict[str, str]:
     """Validate user registration data"""